@@ -3,6 +3,7 @@ from __future__ import annotations
 import dataclasses as _dataclasses
 from collections.abc import Callable, Iterable, Mapping, Sequence
 from dataclasses import fields, is_dataclass
+from functools import cache
 from typing import Any, Literal, cast
 
 from .runtime.backends.lazy import (
@@ -18,6 +19,12 @@ type _DictFactory = Callable[[Iterable[tuple[str, Any]]], Any]
 _SEQUENCE_SKIP_TYPES = (str, bytes, bytearray)
 
 
+@cache
+def _field_names(cls: type[Any]) -> tuple[str, ...]:
+    '''dataclass 的字段在类创建后不再变化, 按类缓存字段名, 不必每个实例都走一次 fields()'''
+    return tuple(field_obj.name for field_obj in fields(cls))
+
+
 def asdict(value: Any, *, relation_policy: RelationPolicy = 'keep') -> Any:
     return _AsdictConverter(relation_policy, dict).convert(value)
 
@@ -62,12 +69,14 @@ class _AsdictConverter:
         self.memo.add(instance_id)
         try:
             state_map = LAZY_RELATION_REGISTRY.get(instance)
+            cls = instance.__class__
+            skip_relations = self.relation_policy == 'skip'
             result: list[tuple[str, Any]] = []
-            for field_obj in fields(instance):
-                name = field_obj.name
+            for name in _field_names(cls):
                 state = None if state_map is None else state_map.get(name)
-                descriptor = _LazyRelationDescriptor.find(instance.__class__, name)
-                if self.relation_policy == 'skip' and descriptor is not None:
+                # 关系描述符在首次查询时才挂到类上, 不能随字段名一起缓存
+                descriptor = _LazyRelationDescriptor.find(cls, name) if skip_relations else None
+                if descriptor is not None:
                     value = [] if descriptor.many else None
                 elif state is not None:
                     value = self._convert_relation(instance, state)
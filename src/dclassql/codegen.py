@@ -8,7 +8,7 @@ from dataclasses import MISSING, dataclass, field, fields
 from datetime import date, datetime
 from enum import Enum
 from types import UnionType
-from typing import Any, Iterable, Mapping, Sequence, Union, Literal
+from typing import Any, Callable, Iterable, Mapping, Sequence, Union, Literal
 
 from jinja2 import Environment, PackageLoader
 
@@ -77,8 +77,8 @@ class ColumnSpecRender:
     auto_increment: bool
     '''是否自增，给主键用的'''
 
-    mapping_value_expr: str
-    '''Mapping payload 转数据库值的生成表达式. 例如 `data['open_order_id']`.'''
+    mapping_value_expr: str | None
+    '''Mapping payload 转数据库值的生成表达式, 例如 `data['status'].value`. 值可原样入库时为 None, 不生成转换语句.'''
 
     insert_value_expr: str
     '''Insert dataclass 或原模型实例转数据库值的生成表达式. 隐式 id 用 getattr 默认 None.'''
@@ -120,7 +120,6 @@ class UpsertWhereRender:
 @dataclass(slots=True)
 class ModelRenderContext:
     name: str
-    datasource_expr: str
     table_name_literal: str
     insert_fields: tuple[InsertFieldSpec, ...]
     typed_dict_fields: tuple[TypedDictFieldSpec, ...]
@@ -190,6 +189,8 @@ class ClientCompiler:
     def __init__(self, graph: ModelGraph, *, client_class_name: str = "GeneratedClient") -> None:
         self.graph = graph
         self.client_class_name = client_class_name
+        self.model_names = tuple(sorted(graph.by_name))
+        '''排序后的模型名, 模型段落、Client 属性与 __all__ 共用同一顺序'''
         self.renderer = TypeHintRenderer({info.model: name for name, info in graph.by_name.items()})
         self.filter_registry = _ScalarFilterRegistry(self.renderer)
 
@@ -206,7 +207,7 @@ class ClientCompiler:
         self.check()
         model_contexts = [
             self.build_model_context(self.graph.by_name[name])
-            for name in sorted(self.graph.by_name)
+            for name in self.model_names
         ]
         import_blocks = self._build_import_blocks()
         client_context = self.build_client_context()
@@ -227,7 +228,7 @@ class ClientCompiler:
             asdict_stub=_render_asdict_stub(model_contexts),
             init_code=_render_init_code(self.client_class_name),
             init_stub=_render_init_stub(self.client_class_name),
-            model_names=tuple(sorted(self.graph.by_name)),
+            model_names=self.model_names,
             client_class_name=self.client_class_name,
         )
 
@@ -282,7 +283,6 @@ class ClientCompiler:
         upsert_where_dicts = self._build_upsert_where(state)
         where_fields, relation_filters = self._build_where_fields(state)
         row_assignments, default_factories = self._build_row_assignments(state)
-        datasource = info.datasource
         constraints = info.constraints
         primary_key = constraints.primary_key.names
         indexes = tuple(group.names for group in constraints.indexes)
@@ -290,7 +290,6 @@ class ClientCompiler:
 
         return ModelRenderContext(
             name=state.name,
-            datasource_expr=f"DataSourceConfig(url={datasource.url!r}, name={datasource.name!r})",
             table_name_literal=repr(state.name),
             insert_fields=tuple(insert_fields),
             typed_dict_fields=tuple(typed_dict_fields),
@@ -328,7 +327,8 @@ class ClientCompiler:
         update_fields: list[TypedDictFieldSpec] = []
         dict_field_map: dict[str, str] = {}
         for column in state.db_columns:
-            annotation = _format_insert_annotation(column, self.renderer)
+            rendered_type = self.renderer.render(column.type_hint)
+            annotation = _format_insert_annotation(column, rendered_type)
             default_expr = _render_default_fragment(state.info.model, column)
             if default_expr is None and column.auto_increment:
                 default_expr = "None"
@@ -340,7 +340,6 @@ class ClientCompiler:
                 typed_annotation = annotation
             typed_dict_fields.append(TypedDictFieldSpec(column.name, typed_annotation))
 
-            rendered_type = self.renderer.render(column.type_hint)
             dict_field_map[column.name] = rendered_type
             update_fields.append(TypedDictFieldSpec(column.name, rendered_type))
         return (
@@ -531,7 +530,7 @@ class ClientCompiler:
             datasource=ClientDataSourceContext(repr(datasource.url), repr(datasource.name)),
             model_bindings=tuple(
                 ClientModelBindingContext(_camel_to_snake(name), name)
-                for name in sorted(self.graph.by_name)
+                for name in self.model_names
             ),
         )
 
@@ -564,9 +563,7 @@ def generate_client(models: Sequence[type[Any]], *, client_class_name: str = "Ge
 
 
 def _build_db_columns(info: ModelInfo) -> tuple[ColumnInfo, ...]:
-    if info.constraints.primary_key.names == ("id",) and all(
-        column.name != "id" for column in info.columns
-    ):
+    if info.has_implicit_id:
         implicit_id = ColumnInfo(
             name="id",
             type_hint=TypeHint(int),
@@ -608,11 +605,11 @@ def _render_init_stub(client_class_name: str) -> str:
     return code
 
 
-def _format_mapping_value_expr(column: ColumnInfo) -> str:
+def _format_mapping_value_expr(column: ColumnInfo) -> str | None:
     if column.storage_kind == "json":
         return f"serialize_json_value(data[{column.name!r}])"
     if column.enum_type is None:
-        return f"data[{column.name!r}]"
+        return None
     value_expr = f"data[{column.name!r}]"
     if column.nullable:
         return f"({value_expr}.value if {value_expr} is not None else None)"
@@ -645,8 +642,8 @@ def _infer_field_fallback(type_hint: TypeHint) -> str:
     return "None"
 
 
-def _format_insert_annotation(col: ColumnInfo, renderer: "TypeHintRenderer") -> str:
-    annotation = renderer.render(col.type_hint)
+def _format_insert_annotation(col: ColumnInfo, rendered_type: str) -> str:
+    annotation = rendered_type
     needs_optional = col.auto_increment
     if needs_optional and "None" not in annotation:
         annotation = f"{annotation} | None"
@@ -705,13 +702,16 @@ def _strip_optional_annotation(annotation: str) -> str:
     return filtered[0] if len(filtered) == 1 else " | ".join(filtered)
 
 
+_CAMEL_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+_NON_ALNUM = re.compile(r"[^0-9a-zA-Z]+")
+
+
 def _camel_to_snake(name: str) -> str:
-    pattern = re.compile(r"(?<!^)(?=[A-Z])")
-    return pattern.sub("_", name).lower()
+    return _CAMEL_BOUNDARY.sub("_", name).lower()
 
 
 def _to_pascal_case(value: str) -> str:
-    parts = re.split(r"[^0-9a-zA-Z]+", value)
+    parts = _NON_ALNUM.split(value)
     return "".join(part[:1].upper() + part[1:] for part in parts if part)
 
 
@@ -848,12 +848,41 @@ class _ScalarFilterRegistry:
         return tuple(self._definitions[name] for name in sorted(self._definitions))
 
 
+@dataclass(slots=True)
+class _RenderJoin:
+    '''渲染栈中的合并指令: 取出最近 arity 个子结果, 交给 join 拼成父类型'''
+    arity: int
+    join: Callable[[list[str]], str]
+
+
 class TypeHintRenderer:
     def __init__(self, model_map: Mapping[type[Any], str]) -> None:
         self._model_map = dict(model_map)
         self._module_imports: defaultdict[str, set[str]] = defaultdict(set) # {module: set of names}
 
     def render(self, type_hint: TypeHint) -> str:
+        # 用显式栈做后序遍历, 深层嵌套的泛型不会逐层压 Python 调用帧
+        output: list[str] = []
+        stack: list[TypeHint | _RenderJoin] = [type_hint]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, _RenderJoin):
+                split = len(output) - item.arity
+                parts = output[split:]
+                del output[split:]
+                output.append(item.join(parts))
+                continue
+            expanded = self._expand(item)
+            if isinstance(expanded, str):
+                output.append(expanded)
+                continue
+            join, children = expanded
+            stack.append(join)
+            stack.extend(reversed(children))
+        return output[0]
+
+    def _expand(self, type_hint: TypeHint) -> str | tuple[_RenderJoin, tuple[TypeHint, ...]]:
+        '''叶子类型直接返回字符串, 泛型返回合并指令与待渲染的子类型'''
         tp = type_hint.source
         if type_hint.is_alias:
             self._module_imports[tp.__module__].add(tp.__name__)
@@ -866,13 +895,16 @@ class TypeHintRenderer:
             return "None"
         if type_hint.is_annotated:
             inner, *metadata = args
-            values = ", ".join(
-                [self.render(TypeHint(inner)), *(repr(value) for value in metadata)]
+            metadata_reprs = [repr(value) for value in metadata]
+            return (
+                _RenderJoin(1, lambda parts: f"Annotated[{', '.join([*parts, *metadata_reprs])}]"),
+                (TypeHint(inner),),
             )
-            return f"Annotated[{values}]"
         if origin in (UnionType, Union):
-            parts = [self.render(TypeHint(arg)) for arg in args]
-            return " | ".join(dict.fromkeys(parts))
+            return (
+                _RenderJoin(len(args), lambda parts: " | ".join(dict.fromkeys(parts))),
+                tuple(TypeHint(arg) for arg in args),
+            )
         if origin is Literal:
             values = ", ".join(repr(value) for value in args)
             return f"Literal[{values}]"
@@ -884,16 +916,20 @@ class TypeHintRenderer:
                 container = "frozenset"
             else:
                 container = "list"
-            return f"{container}[{self.render(TypeHint(args[0]))}]"
+            return _RenderJoin(1, lambda parts: f"{container}[{parts[0]}]"), (TypeHint(args[0]),)
         if origin is tuple:
             if len(args) == 2 and args[1] is Ellipsis:
-                return f"tuple[{self.render(TypeHint(args[0]))}, ...]"
-            return f"tuple[{', '.join(self.render(TypeHint(arg)) for arg in args)}]"
+                return _RenderJoin(1, lambda parts: f"tuple[{parts[0]}, ...]"), (TypeHint(args[0]),)
+            return (
+                _RenderJoin(len(args), lambda parts: f"tuple[{', '.join(parts)}]"),
+                tuple(TypeHint(arg) for arg in args),
+            )
         if origin is dict:
             key, value = args or (Any, Any)
-            return f"dict[{self.render(TypeHint(key))}, {self.render(TypeHint(value))}]"
-        if origin is None:
-            pass
+            return (
+                _RenderJoin(2, lambda parts: f"dict[{parts[0]}, {parts[1]}]"),
+                (TypeHint(key), TypeHint(value)),
+            )
         if isinstance(tp, type):
             mapped = self._model_map.get(tp)
             if mapped is not None:
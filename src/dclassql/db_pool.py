@@ -3,17 +3,25 @@ import sqlite3
 import threading
 from typing import Any, Callable, Concatenate, Protocol
 
+from dclassql.runtime.datasource import close_sqlite_connection
+
 
 class HasLocalClass(Protocol):
     _local: threading.local
 
 
+_MISSING: Any = object()
+
+
 def save_local[C: HasLocalClass, **P, T](
     func: Callable[Concatenate[C, P], T] | None = None,
     *,
     key: Callable[[Any, Callable[..., object]], object] | None = None,
 ) -> Callable[[Callable[Concatenate[C, P], T]], Callable[Concatenate[C, P], T]] | Callable[Concatenate[C, P], T]:
     def decorator(func: Callable[Concatenate[C, P], T]) -> Callable[Concatenate[C, P], T]:
+        # 所有子类共用同一个 _local, 只用方法名做键时不同池里的同名方法会互相串用缓存
+        default_key = (func.__module__, func.__qualname__)
+
         @functools.wraps(func)
         def wrapper(self: C, *args: P.args, **kwargs: P.kwargs) -> T:
             cache = getattr(self._local, "_dclassql_cache", None)
@@ -21,9 +29,10 @@ def save_local[C: HasLocalClass, **P, T](
                 cache = {}
                 self._local._dclassql_cache = cache
 
-            cache_key = key(self, func) if key is not None else func.__name__
-            if cache_key in cache:
-                return cache[cache_key]
+            cache_key = key(self, func) if key is not None else default_key
+            value = cache.get(cache_key, _MISSING)
+            if value is not _MISSING:
+                return value
 
             value = func(self, *args, **kwargs)
             cache[cache_key] = value
@@ -72,11 +81,18 @@ class BaseDBPool:
         if cache is None:
             return
         for key, obj in list(cache.items()):
-            label = repr(key)
-            if hasattr(obj, 'close') and callable(obj.close):
+            if isinstance(obj, sqlite3.Connection):
+                if verbose:
+                    print(f'Closing {key!r}')
+                close_sqlite_connection(obj)
+                del cache[key]
+                continue
+            # 一次 getattr 取到绑定方法, 代替 hasattr + 两次属性查找
+            close = getattr(obj, 'close', None)
+            if callable(close):
                 if verbose:
-                    print(f'Closing {label}')
-                obj.close()
+                    print(f'Closing {key!r}')
+                close()
             del cache[key]
 
     @classmethod
@@ -84,6 +100,8 @@ class BaseDBPool:
         conn.execute('PRAGMA journal_mode = WAL;')
         conn.execute('PRAGMA synchronous = NORMAL;')
         conn.execute('pragma temp_store = memory;')
+        # 页缓存上限 64 MiB (负数单位为 KiB), 按需分配; 默认 2 MiB 对分析型读取偏小
+        conn.execute('PRAGMA cache_size = -65536;')
         conn.execute('pragma page_size = 32768;')
         conn.execute("PRAGMA busy_timeout = 3000;")
         conn.execute('PRAGMA journal_size_limit=104857600;')
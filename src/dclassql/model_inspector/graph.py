@@ -4,6 +4,7 @@ import sys
 from dataclasses import MISSING, dataclass, fields, is_dataclass
 from datetime import date, datetime
 from enum import Enum
+from functools import cache
 from types import UnionType
 from typing import (
     Any,
@@ -169,22 +170,28 @@ class ColumnInfo:
             return None, None
         if not isinstance(source, type) or type_hint.origin is not None:
             return None
-        enum_type = source if issubclass(source, Enum) else None
-        if source is bool:
-            return bool, enum_type
-        if issubclass(source, str):
-            return str, enum_type
-        if issubclass(source, bytes):
-            return bytes, enum_type
-        if issubclass(source, datetime):
-            return datetime, enum_type
-        if issubclass(source, date):
-            return date, enum_type
-        if issubclass(source, float):
-            return float, enum_type
-        if issubclass(source, int):
-            return int, enum_type
-        return (None, enum_type) if enum_type is not None else None
+        return _scalar_class_info(source)
+
+
+@cache
+def _scalar_class_info(source: type[Any]) -> tuple[type[Any] | None, type[Enum] | None] | None:
+    '''按类缓存 issubclass 判定链, 同一注解类型在多个列/模型间只走一次 MRO'''
+    enum_type = source if issubclass(source, Enum) else None
+    if source is bool:
+        return bool, enum_type
+    if issubclass(source, str):
+        return str, enum_type
+    if issubclass(source, bytes):
+        return bytes, enum_type
+    if issubclass(source, datetime):
+        return datetime, enum_type
+    if issubclass(source, date):
+        return date, enum_type
+    if issubclass(source, float):
+        return float, enum_type
+    if issubclass(source, int):
+        return int, enum_type
+    return (None, enum_type) if enum_type is not None else None
 
 
 @dataclass(slots=True, frozen=True)
@@ -210,6 +217,22 @@ class ModelInfo:
     columns: list[ColumnInfo]
     constraints: TableConstraints
     datasource: DataSourceConfig
+    include_literals: tuple[str, ...] = ()
+    '''按名字排序的关系属性名, 即 `T*IncludeCol` / `*IncludeDict` 的取值'''
+
+    sortable_literals: tuple[str, ...] = ()
+    '''数据库列名 (含隐式 id), 即 `T*SortableCol` / `*OrderByDict` 的取值'''
+
+    @property
+    def has_implicit_id(self) -> bool:
+        '''默认主键 `id` 不在 dataclass 字段里, 需要由后端补一个自增列'''
+        return _has_implicit_id(self.constraints, self.columns)
+
+
+def _has_implicit_id(constraints: TableConstraints, columns: Sequence[ColumnInfo]) -> bool:
+    return constraints.primary_key.names == ("id",) and all(
+        column.name != "id" for column in columns
+    )
 
 
 def _validate_model_supports_weakref(model: type[Any]) -> None:
@@ -276,23 +299,32 @@ class ModelGraph:
             registry,
         )
         # 所有关系都收集后，才能正确构建 ModelInfo
-        model_infos = [
-            ModelInfo(
-                model=model,
-                columns=ColumnInfo.from_model(
-                    model,
-                    type_hints_by_model[model],
-                    constraints_by_model[model],
-                    {
-                        relationship.local.attribute
-                        for relationship in relationships.by_model(model)
-                    },
-                ),
-                constraints=constraints_by_model[model],
-                datasource=_module_datasource(modules[model]),
+        model_infos: list[ModelInfo] = []
+        for model in models:
+            relation_names = tuple(sorted(
+                relationship.local.attribute
+                for relationship in relationships.by_model(model)
+            ))
+            constraints = constraints_by_model[model]
+            columns = ColumnInfo.from_model(
+                model,
+                type_hints_by_model[model],
+                constraints,
+                set(relation_names),
+            )
+            column_names = tuple(column.name for column in columns)
+            if _has_implicit_id(constraints, columns):
+                column_names = ("id", *column_names)
+            model_infos.append(
+                ModelInfo(
+                    model=model,
+                    columns=columns,
+                    constraints=constraints,
+                    datasource=_module_datasource(modules[model]),
+                    include_literals=relation_names,
+                    sortable_literals=column_names,
+                )
             )
-            for model in models
-        ]
         graph = cls(models, model_infos, relationships)
         graph._validate_relationships()
         return graph
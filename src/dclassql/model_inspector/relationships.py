@@ -178,6 +178,8 @@ class _ProxyLink(Link):
 
 
 class _FakeSelf:
+    __slots__ = ("_model", "_type_hints", "_links")
+
     def __init__(
         self,
         model: type[Any],
@@ -1,6 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from types import GeneratorType
-from typing import Any, Iterable, Self
+from typing import Any, Iterable, Iterator, Self
+from weakref import WeakKeyDictionary
 
 
 @dataclass(slots=True, frozen=True)
@@ -11,20 +12,21 @@ class Col:
 @dataclass(slots=True, frozen=True)
 class ColGroup:
     cols: tuple[Col, ...]
+    names: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    '''列名元组, 构造时算好; 建模与生成代码时会被反复读取'''
 
     def __post_init__(self) -> None:
         if not self.cols:
             raise ValueError('ColGroup cannot be empty')
-        if not all(isinstance(col, Col) for col in self.cols):
-            raise TypeError('ColGroup cols must be Col instances')
+        for col in self.cols:
+            if not isinstance(col, Col):
+                raise TypeError('ColGroup cols must be Col instances')
+        object.__setattr__(self, 'names', tuple(col.name for col in self.cols))
 
     @classmethod
     def from_cols(cls, *cols: Col) -> Self:
         return cls(cols=tuple(cols))
 
-    @property
-    def names(self) -> tuple[str, ...]:
-        return tuple(col.name for col in self.cols)
 
 class FakeSelf:
     def __getattr__(self, name: str) -> Col:
@@ -37,20 +39,28 @@ class TableConstraints:
     unique_indexes: tuple[ColGroup, ...]
 
     def is_unique(self, columns: Iterable[str]) -> bool:
+        # 目标列集合只构建一次, 每个分组用 C 层的集合比较代替逐组重建两个 set
         column_names = tuple(columns)
+        wanted = frozenset(column_names)
         groups = (self.primary_key, *self.unique_indexes)
         return any(
             len(group.names) == len(column_names)
-            and set(group.names) == set(column_names)
+            and wanted.issuperset(group.names)
             for group in groups
         )
 
     @staticmethod
     def _coerce_cols(value: Any) -> tuple[Col, ...]:
+        value_type = type(value)
+        if value_type is Col:
+            return (value,)
+        # 绝大多数写法是 Col 元组/列表: 先用类型指针比较走快路径, 避开 Iterable ABC 的 isinstance 分派
+        if value_type is tuple or value_type is list:
+            collected = tuple(value)
+            if collected and all(type(col) is Col for col in collected):
+                return collected
         if isinstance(value, Col):
             return (value,)
-        if isinstance(value, tuple) and value and all(isinstance(col, Col) for col in value):
-            return value
         if isinstance(value, Iterable):
             collected = tuple(value)
             if not collected:
@@ -69,48 +79,62 @@ class TableConstraints:
         return ColGroup(TableConstraints._coerce_cols(value))
 
     @staticmethod
-    def _iter_index_specs(raw: Any) -> Iterable[Any]:
-        if isinstance(raw, (ColGroup, Col)):
-            yield raw
-            return
-        if isinstance(raw, tuple) and raw and all(isinstance(col, Col) for col in raw):
-            yield raw
-            return
-        if isinstance(raw, Iterable):
-            for item in raw:
-                yield from TableConstraints._iter_index_specs(item)
-            return
-        raise TypeError(f'Unsupported index specification: {raw!r}')
+    def _iter_index_groups(raw: Any) -> Iterator[ColGroup]:
+        # 展开嵌套写法与归一化合并为一趟: 显式栈代替递归 yield from, 逆序压栈以保持声明顺序
+        stack = [raw]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, ColGroup):
+                yield item
+                continue
+            if isinstance(item, Col):
+                yield ColGroup((item,))
+                continue
+            if isinstance(item, tuple) and item and all(isinstance(col, Col) for col in item):
+                yield ColGroup(item)
+                continue
+            item_type = type(item)
+            # 元组/列表先用类型指针比较放行, 其余才走 Iterable ABC 的 isinstance 分派
+            if item_type is not tuple and item_type is not list:
+                if isinstance(item, (str, bytes)) or not isinstance(item, Iterable):
+                    raise TypeError(f'Unsupported index specification: {item!r}')
+            stack.extend(reversed(tuple(item)))
 
     @staticmethod
-    def _normalize_index_spec(value: Any) -> ColGroup:
-        if isinstance(value, ColGroup):
-            return value
-        return ColGroup(TableConstraints._coerce_cols(value))
+    def from_dc(dc: type) -> 'TableConstraints':
+        '''结果只取决于模型类本身, 按类缓存; 类被回收时缓存随之释放'''
+        cached = _CONSTRAINTS_CACHE.get(dc)
+        if cached is None:
+            cached = TableConstraints._build(dc)
+            _CONSTRAINTS_CACHE[dc] = cached
+        return cached
 
     @staticmethod
-    def from_dc(dc: type) -> 'TableConstraints':
+    def _build(dc: type) -> 'TableConstraints':
         primary_key = ColGroup.from_cols(Col('id'))
 
         fake_self = FakeSelf()
-        if hasattr(dc, 'primary_key'):
-            pk = getattr(dc, 'primary_key')(fake_self)
-            primary_key = TableConstraints._resolve_primary_key(pk)
+        pk_fn = getattr(dc, 'primary_key', None)
+        idx_fn = getattr(dc, 'index', None)
+        uidx_fn = getattr(dc, 'unique_index', None)
+        if pk_fn is not None:
+            primary_key = TableConstraints._resolve_primary_key(pk_fn(fake_self))
 
         indexes: list[ColGroup] = []
-        if hasattr(dc, 'index'):
-            raw_indexes = getattr(dc, 'index')(fake_self)
+        if idx_fn is not None:
+            raw_indexes = idx_fn(fake_self)
             if raw_indexes is not None:
-                for idx in TableConstraints._iter_index_specs(raw_indexes):
-                    indexes.append(TableConstraints._normalize_index_spec(idx))
+                indexes.extend(TableConstraints._iter_index_groups(raw_indexes))
         unique_indexes: list[ColGroup] = []
-        if hasattr(dc, 'unique_index'):
-            raw_unique_indexes = getattr(dc, 'unique_index')(fake_self)
+        if uidx_fn is not None:
+            raw_unique_indexes = uidx_fn(fake_self)
             if raw_unique_indexes is not None:
-                for uidx in TableConstraints._iter_index_specs(raw_unique_indexes):
-                    unique_indexes.append(TableConstraints._normalize_index_spec(uidx))
+                unique_indexes.extend(TableConstraints._iter_index_groups(raw_unique_indexes))
         return TableConstraints(
             primary_key=primary_key,
             indexes=tuple(indexes),
             unique_indexes=tuple(unique_indexes),
         )
+
+
+_CONSTRAINTS_CACHE: WeakKeyDictionary[type, TableConstraints] = WeakKeyDictionary()
@@ -28,6 +28,7 @@ def db_push(
     provider: str,
     sync_indexes: bool = False,
     confirm_rebuild: ConfirmRebuildCallback | None = None,
+    fast_push: bool = False,
 ) -> None:
     pusher = get_pusher(provider)
     pusher.push(
@@ -35,6 +36,7 @@ def db_push(
         tables,
         sync_indexes=sync_indexes,
         confirm_rebuild=confirm_rebuild,
+        fast_push=fast_push,
     )
 
 
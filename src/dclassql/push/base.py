@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
-from typing import Any, Callable, Iterable, Sequence
+from typing import Any, Callable, Iterable, Mapping, Sequence
 
-from pypika import Query, Table
-from pypika.queries import Column
-from pypika.terms import Index as PypikaIndex
+from pypika.utils import format_quotes
 
 from ..runtime.backends.metadata import ColumnSpec
 from ..runtime.backends.protocols import SchemaTableProtocol
@@ -92,7 +91,7 @@ class SchemaBuilder(ABC):
 
     def render_create_table_sql(self) -> str:
         self._column_declarations = []
-        builder = Query.create_table(self.table_name).if_not_exists()
+        column_parts: list[str] = []
 
         pk_cols = self.table.primary_key
         pk_set = set(pk_cols)
@@ -102,7 +101,7 @@ class SchemaBuilder(ABC):
         if self._uses_implicit_id_primary_key(pk_cols, column_names):
             declaration = self.implicit_id_declaration()
             self._column_declarations.append(declaration)
-            builder = builder.columns(self.make_column(declaration.name, declaration.definition_sql))
+            column_parts.append(self.make_column(declaration.name, declaration.definition_sql))
             single_inline_pk = True
 
         for column in self.table.column_specs:
@@ -113,15 +112,17 @@ class SchemaBuilder(ABC):
                 single_inline_pk=single_inline_pk,
             )
             self._column_declarations.append(declaration)
-            builder = builder.columns(self.make_column(column.name, declaration.definition_sql))
+            column_parts.append(self.make_column(column.name, declaration.definition_sql))
 
-        if pk_cols:
-            if len(pk_cols) == 1 and not single_inline_pk:
-                builder = builder.primary_key(*pk_cols)
-            elif len(pk_cols) > 1:
-                builder = builder.primary_key(*pk_cols)
+        if len(pk_cols) > 1 or (len(pk_cols) == 1 and not single_inline_pk):
+            pk_sql = ','.join(self.quote_identifier(name) for name in pk_cols)
+            column_parts.append(f'PRIMARY KEY ({pk_sql})')
 
-        return builder.get_sql(quote_char=self.quote_char) + ';'
+        # 与 pypika CreateQueryBuilder 的输出保持一致: 列之间只用逗号分隔
+        return (
+            f'CREATE TABLE IF NOT EXISTS {self.quote_identifier(self.table_name)} '
+            f'({",".join(column_parts)});'
+        )
 
     def _uses_implicit_id_primary_key(self, pk_cols: tuple[str, ...], column_names: set[str]) -> bool:
         return pk_cols == ("id",) and "id" not in column_names
@@ -150,8 +151,11 @@ class SchemaBuilder(ABC):
             )
         return definitions
 
-    def make_column(self, name: str, definition: str) -> Column:
-        return Column(name, definition)
+    def make_column(self, name: str, definition: str) -> str:
+        return f'{self.quote_identifier(name)} {definition}'
+
+    def quote_identifier(self, name: str) -> str:
+        return format_quotes(name, self.quote_char)
 
     def render_column_declaration(
         self,
@@ -214,22 +218,16 @@ class SchemaBuilder(ABC):
         return f'{prefix}_{self.table_name}_{suffix}'
 
     def create_index_sql(self, definition: IndexDefinition) -> str:
-        table = Table(self.table_name)
-        index = PypikaIndex(definition.name)
-        columns_sql = ', '.join(
-            table.field(column).get_sql(quote_char=self.quote_char) for column in definition.columns
-        )
+        columns_sql = ', '.join(self.quote_identifier(column) for column in definition.columns)
         unique_keyword = 'UNIQUE ' if definition.unique else ''
-        index_sql = (
+        return (
             f'CREATE {unique_keyword}INDEX IF NOT EXISTS '
-            f'{index.get_sql(quote_char=self.quote_char)} '
-            f'ON {table.get_sql(quote_char=self.quote_char)} ({columns_sql});'
+            f'{self.quote_identifier(definition.name)} '
+            f'ON {self.quote_identifier(self.table_name)} ({columns_sql});'
         )
-        return index_sql
 
     def drop_index_sql(self, index_name: str) -> str:
-        index = PypikaIndex(index_name)
-        return f'DROP INDEX IF EXISTS {index.get_sql(quote_char=self.quote_char)};'
+        return f'DROP INDEX IF EXISTS {self.quote_identifier(index_name)};'
 
     def _has_inline_primary_key(self, pk_columns: tuple[str, ...]) -> bool:
         if len(pk_columns) != 1:
@@ -365,6 +363,14 @@ class DatabasePusher(ABC):
     def validate_connection(self, conn: Any) -> None:
         return None
 
+    def prefetch_existing_indexes(self, conn: Any) -> Mapping[str, set[str]] | None:
+        '''一次取回所有表的索引名, 按表名分组; 返回 None 时逐表调用 fetch_existing_indexes'''
+        return None
+
+    def fast_push_session(self, conn: Any) -> AbstractContextManager[None]:
+        '''`fast_push=True` 时包住整个推送过程, 后端可在此临时放宽持久化设置'''
+        return nullcontext()
+
     def push(
         self,
         conn: Any,
@@ -372,8 +378,27 @@ class DatabasePusher(ABC):
         *,
         sync_indexes: bool = False,
         confirm_rebuild: ConfirmRebuildCallback | None = None,
+        fast_push: bool = False,
     ) -> None:
         self.validate_connection(conn)
+        session = self.fast_push_session(conn) if fast_push else nullcontext()
+        with session:
+            self._push_tables(
+                conn,
+                tables,
+                sync_indexes=sync_indexes,
+                confirm_rebuild=confirm_rebuild,
+            )
+
+    def _push_tables(
+        self,
+        conn: Any,
+        tables: Sequence[SchemaTableProtocol],
+        *,
+        sync_indexes: bool,
+        confirm_rebuild: ConfirmRebuildCallback | None,
+    ) -> None:
+        index_snapshot = self.prefetch_existing_indexes(conn)
         for table in tables:
             builder = self.schema_builder_cls(table)
             plan = builder.build()
@@ -399,8 +424,14 @@ class DatabasePusher(ABC):
                 if not confirm_rebuild(table, plan, existing_schema, diff):
                     raise RuntimeError(self.format_diff_message(table, diff))
                 self.rebuild_table(conn, table, builder, plan, existing_schema, diff)
+                # 重建会改动索引, 预取的快照对这张表已失效
+                existing_indexes = None
+            elif index_snapshot is not None:
+                existing_indexes = index_snapshot.get(table.table_name, set())
+            else:
+                existing_indexes = None
 
-            self._sync_indexes(conn, table, builder, plan.indexes, sync_indexes)
+            self._sync_indexes(conn, table, builder, plan.indexes, sync_indexes, existing_indexes)
 
     def _sync_indexes(
         self,
@@ -409,8 +440,10 @@ class DatabasePusher(ABC):
         builder: SchemaBuilder,
         index_definitions: tuple[IndexDefinition, ...],
         sync_indexes: bool,
+        existing_indexes: set[str] | None = None,
     ) -> None:
-        existing_indexes = self.fetch_existing_indexes(conn, table)
+        if existing_indexes is None:
+            existing_indexes = self.fetch_existing_indexes(conn, table)
         expected_names = {definition.name for definition in index_definitions}
 
         statements: list[str] = []
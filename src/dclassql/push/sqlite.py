@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import sqlite3
+from contextlib import contextmanager
 from datetime import date, datetime
-from typing import Any, Iterable, Mapping, Sequence
+from functools import cache
+from typing import Any, Iterable, Iterator, Mapping, Sequence
 
 from pypika import Query, Table
 from pypika.utils import format_quotes
@@ -32,23 +34,36 @@ TYPE_MAP: Mapping[type[Any], str] = {
 }
 
 
+_TYPE_MAP_GET = TYPE_MAP.get
+
+
 def _infer_sqlite_type(annotation: Any) -> str:
+    # 绝大多数列直接标注为 int/str/datetime 等, 命中映射表即可返回
+    if isinstance(annotation, type):
+        sql_type = _TYPE_MAP_GET(annotation)
+        if sql_type is not None:
+            return sql_type
     type_hint = TypeHint(annotation).without_transparent_wrappers()
     annotation = type_hint.source
-    origin = type_hint.origin
-    if origin is None and isinstance(annotation, type):
-        if annotation in TYPE_MAP:
-            return TYPE_MAP[annotation]
-        if issubclass(annotation, str):
-            return "TEXT"
-        if issubclass(annotation, bytes):
-            return "BLOB"
-        if issubclass(annotation, int):
-            return "INTEGER"
-        if issubclass(annotation, float):
-            return "REAL"
-    if origin in (list, set, tuple):
+    if type_hint.origin is None and isinstance(annotation, type):
+        return _infer_sqlite_class_type(annotation)
+    # list/tuple/dict 等容器按 JSON 文本存储
+    return "TEXT"
+
+
+@cache
+def _infer_sqlite_class_type(annotation: type[Any]) -> str:
+    sql_type = _TYPE_MAP_GET(annotation)
+    if sql_type is not None:
+        return sql_type
+    if issubclass(annotation, str):
         return "TEXT"
+    if issubclass(annotation, bytes):
+        return "BLOB"
+    if issubclass(annotation, int):
+        return "INTEGER"
+    if issubclass(annotation, float):
+        return "REAL"
     return "TEXT"
 
 
@@ -116,6 +131,19 @@ class SQLitePusher(DatabasePusher):
         if not isinstance(conn, sqlite3.Connection):
             raise TypeError("SQLite connections must be sqlite3.Connection")
 
+    @contextmanager
+    def fast_push_session(self, conn: sqlite3.Connection) -> Iterator[None]:
+        # 推送期间关闭 fsync 并把回滚日志放到内存, 结束后恢复原设置
+        (synchronous,) = conn.execute("PRAGMA synchronous").fetchone()
+        (journal_mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA journal_mode = MEMORY")
+        try:
+            yield
+        finally:
+            conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+            conn.execute(f"PRAGMA synchronous = {int(synchronous)}")
+
     def table_exists(self, conn: sqlite3.Connection, table: SchemaTableProtocol) -> bool:
         cur = conn.execute(
             "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
@@ -151,17 +179,24 @@ class SQLitePusher(DatabasePusher):
         )
         return {name for (name,) in cur.fetchall()}
 
+    def prefetch_existing_indexes(self, conn: sqlite3.Connection) -> dict[str, set[str]]:
+        cur = conn.execute("SELECT tbl_name, name FROM sqlite_master WHERE type IN ('index','unique')")
+        existing: dict[str, set[str]] = {}
+        for table_name, name in cur.fetchall():
+            existing.setdefault(table_name, set()).add(name)
+        return existing
+
     def execute_statements(self, conn: sqlite3.Connection, statements: Iterable[str]) -> None:
         savepoint = "dclassql_schema_push"
-        conn.execute(f"SAVEPOINT {savepoint}")
-        try:
-            for sql in statements:
-                conn.execute(sql)
-        except BaseException:
-            conn.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
-            conn.execute(f"RELEASE SAVEPOINT {savepoint}")
-            raise
-        conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+        body = "\n".join(sql if sql.rstrip().endswith(";") else f"{sql};" for sql in statements)
+        if body:
+            try:
+                # 整批语句一次交给 executescript, 省去逐条 execute 的往返; SAVEPOINT 保证要么全部生效要么全部回滚
+                conn.executescript(f"SAVEPOINT {savepoint};\n{body}\nRELEASE SAVEPOINT {savepoint};")
+            except BaseException:
+                conn.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+                raise
         conn.commit()
 
     def is_system_index(self, name: str) -> bool:
@@ -240,5 +275,12 @@ def push_sqlite(
     *,
     sync_indexes: bool = False,
     confirm_rebuild: ConfirmRebuildCallback | None = None,
+    fast_push: bool = False,
 ) -> None:
-    SQLITE_PUSHER.push(conn, tables, sync_indexes=sync_indexes, confirm_rebuild=confirm_rebuild)
+    SQLITE_PUSHER.push(
+        conn,
+        tables,
+        sync_indexes=sync_indexes,
+        confirm_rebuild=confirm_rebuild,
+        fast_push=fast_push,
+    )
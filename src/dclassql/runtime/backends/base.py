@@ -2,21 +2,48 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 import warnings
+from functools import cache
 from typing import Any, Literal, Mapping, Sequence, cast, overload
 
 from pypika import Query, Table
 from pypika.enums import Order
 from pypika.functions import Count
 from pypika.queries import QueryBuilder
-from pypika.terms import Criterion, Parameter
+from pypika.terms import Criterion, Field, Parameter
 from pypika.utils import format_quotes
 
 from dclassql.runtime.sql_recorder import push_sql
 from dclassql.typing import IncludeT, InsertT, ModelT, OrderByT, OrderDirection, UpsertWhereT, WhereT
 
-from .lazy import LazyRelationState
+from .lazy import LazyRelationState, ensure_lazy_descriptor
 from .protocols import BackendProtocol, TableProtocol
-from .where_compiler import WhereCompiler
+from .where_compiler import WhereCompiler, json_array_param
+
+
+@cache
+def _upsert_conflict_targets(table_cls: type[Any]) -> tuple[tuple[frozenset[str], tuple[str, ...]], ...]:
+    '''主键与唯一索引都是生成表类的类属性, 按类缓存可作为 upsert 冲突目标的列组'''
+    targets: list[tuple[str, ...]] = []
+    if table_cls.primary_key:
+        targets.append(tuple(table_cls.primary_key))
+    targets.extend(tuple(idx) for idx in getattr(table_cls, "unique_indexes", ()))
+    return tuple((frozenset(target), target) for target in targets)
+
+
+_PLAIN_COMPARISONS: dict[str, str] = {"EQ": "=", "LT": "<", "LTE": "<=", "GT": ">", "GTE": ">="}
+_PLAIN_MEMBERSHIP: dict[str, str] = {"IN": "IN", "NOT_IN": "NOT IN"}
+_PLAIN_IN_LIMIT = 32
+'''IN 列表的长度也是 SQL 形态的一部分; 超过该长度的列表交给 PyPika, 避免缓存随长度无限增长'''
+
+
+type _PlainCondition = tuple[str, str, int, bool]
+'''(列名, 运算符, 参数个数, 是否整个 IN 列表绑定为一个 JSON 数组参数经 json_each 展开)'''
+
+
+@cache
+def _is_operator_mapping(value_type: type[Any]) -> bool:
+    '''where 值是否为运算符字典; 按类型缓存, 等值条件不必每个值都走一次 ABC 的 isinstance'''
+    return issubclass(value_type, Mapping)
 
 
 class BackendBase(BackendProtocol, ABC):
@@ -26,9 +53,17 @@ class BackendBase(BackendProtocol, ABC):
     table_cls: type[Table] = Table
     parameter_cls: type[Parameter] = Parameter
     like_escape_char: str | None = "\\"
+    max_variable_number: int = 999
+    '''单条语句可绑定参数的上限, 批量 IN 预取按此切分'''
+    json_in_threshold: int | None = None
+    '''IN 列表长于该值时整体绑定为一个 JSON 数组参数 (json_each); None 表示总是逐项展开占位符'''
 
     def __init__(self, *, echo_sql: bool = False) -> None:
         self._echo_sql = echo_sql
+        self._insert_sql_cache: dict[tuple[type[Any], tuple[str, ...], int], str] = {}
+        self._select_sql_cache: dict[tuple[Any, ...], str] = {}
+        self._mutation_sql_cache: dict[tuple[Any, ...], str] = {}
+        self._select_source_cache: dict[tuple[type[Any], bool], tuple[Table, tuple[Field, ...]]] = {}
 
     def _execute_returning_transaction(
         self,
@@ -58,32 +93,100 @@ class BackendBase(BackendProtocol, ABC):
         if not payload:
             raise ValueError("Insert payload cannot be empty")
 
-        sql_table = self.table_cls(table.model.__name__)
-        column_names = list(payload)
+        column_names = tuple(payload)
         params = [payload[name] for name in column_names]
-
-        insert_query: QueryBuilder = (
-            self.query_cls.into(sql_table)
-            .columns(*column_names)
-            .insert(*(self.new_parameter() for _ in column_names))
-        )
-        sql = self._render_query(insert_query)
-        returning_columns = [spec.name for spec in table.column_specs]
-        sql_with_returning = self._append_returning(sql, returning_columns)
+        sql_with_returning = self._insert_returning_sql(table, column_names, 1)
 
         row = self.query_raw(sql_with_returning, params, auto_commit=True)[0]
         result = self._materialize_instance(table, row, include_map={})
         return result
 
+    def _insert_returning_sql(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        column_names: tuple[str, ...],
+        row_count: int,
+        *,
+        cache: bool = True,
+    ) -> str:
+        '''INSERT ... RETURNING 只由表、列名和行数决定, 渲染结果按此缓存
+
+        行数不固定的批次 (如 insert_many 的尾批) 传 cache=False, 只拼接不入缓存, 避免缓存随行数无限增长
+        '''
+        key = (type(table), column_names, row_count)
+        sql = self._insert_sql_cache.get(key)
+        if sql is not None:
+            return sql
+        sql = self._append_returning(
+            self._render_insert_sql(table, column_names, row_count),
+            [spec.name for spec in table.column_specs],
+        )
+        if cache:
+            self._insert_sql_cache[key] = sql
+        return sql
+
+    def _insert_values_sql(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        column_names: tuple[str, ...],
+    ) -> str:
+        '''不带 RETURNING 的单行 INSERT, 供 executemany 复用; 缓存键里行数记为 0 以区分'''
+        key = (type(table), column_names, 0)
+        sql = self._insert_sql_cache.get(key)
+        if sql is None:
+            sql = self._render_insert_sql(table, column_names, 1)
+            self._insert_sql_cache[key] = sql
+        return sql
+
+    def _render_insert_sql(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        column_names: tuple[str, ...],
+        row_count: int,
+    ) -> str:
+        if not self.quote_char:
+            sql_table = self.table_cls(table.model.__name__)
+            insert_query: QueryBuilder = self.query_cls.into(sql_table).columns(*column_names)
+            for _ in range(row_count):
+                insert_query = insert_query.insert(*(self.new_parameter() for _ in column_names))
+            return self._render_query(insert_query)
+        # 直接拼接, 与 PyPika 渲染一致; 未缓存的尾批也只需一次 join
+        quote = self.escape_identifier
+        columns = ",".join(quote(column) for column in column_names)
+        row = f"({','.join([self.parameter_token] * len(column_names))})"
+        return f"INSERT INTO {quote(table.model.__name__)} ({columns}) VALUES {','.join([row] * row_count)};"
+
+    @overload
     def insert_many(
         self,
         table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
         data: Sequence[InsertT | ModelT | Mapping[str, object]],
         *,
         batch_size: int | None = None,
-    ) -> list[ModelT]:
+        return_records: Literal[True] = True,
+    ) -> list[ModelT]: ...
+
+    @overload
+    def insert_many(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        data: Sequence[InsertT | ModelT | Mapping[str, object]],
+        *,
+        batch_size: int | None = None,
+        return_records: Literal[False],
+    ) -> int: ...
+
+    def insert_many(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        data: Sequence[InsertT | ModelT | Mapping[str, object]],
+        *,
+        batch_size: int | None = None,
+        return_records: Literal[False, True] = True,
+    ) -> list[ModelT] | int:
         _ = batch_size  # 基础实现不做批量优化
-        return [self.insert(table, item) for item in data]
+        inserted = [self.insert(table, item) for item in data]
+        return inserted if return_records else len(inserted)
 
     def update(
         self,
@@ -97,21 +200,26 @@ class BackendBase(BackendProtocol, ABC):
         if not payload:
             raise ValueError("Update payload cannot be empty")
 
-        sql_table = self.table_cls(table.model.__name__)
-        update_query: QueryBuilder = self.query_cls.update(sql_table)
-        params: list[Any] = []
-        for column, value in payload.items():
-            update_query = update_query.set(sql_table.field(column), self.new_parameter())
-            params.append(value)
+        plain_mutation = self._build_mutation_sql(table, tuple(payload), where, returning=True) if where else None
+        if plain_mutation is not None:
+            sql_with_returning, where_params = plain_mutation
+            params: list[Any] = [*payload.values(), *where_params]
+        else:
+            sql_table = self.table_cls(table.model.__name__)
+            update_query: QueryBuilder = self.query_cls.update(sql_table)
+            params = []
+            for column, value in payload.items():
+                update_query = update_query.set(sql_table.field(column), self.new_parameter())
+                params.append(value)
 
-        criterion, where_params = self._compile_where(table, sql_table, where)
-        if criterion is not None:
-            update_query = update_query.where(criterion)
-            params.extend(where_params)
+            criterion, where_params = self._compile_where(table, sql_table, where)
+            if criterion is not None:
+                update_query = update_query.where(criterion)
+                params.extend(where_params)
 
-        sql = self._render_query(update_query)
-        returning_columns = [spec.name for spec in table.column_specs]
-        sql_with_returning = self._append_returning(sql, returning_columns)
+            sql = self._render_query(update_query)
+            returning_columns = [spec.name for spec in table.column_specs]
+            sql_with_returning = self._append_returning(sql, returning_columns)
 
         rows = self._execute_returning_transaction(
             sql_with_returning,
@@ -136,17 +244,14 @@ class BackendBase(BackendProtocol, ABC):
         include: Mapping[str, bool] | None = None,
     ) -> ModelT:
         where_payload = dict(where)
-        conflict_targets: list[tuple[str, ...]] = []
-        if table.primary_key:
-            conflict_targets.append(tuple(table.primary_key))
-        conflict_targets.extend(tuple(idx) for idx in getattr(table, "unique_indexes", ()))
+        conflict_targets = _upsert_conflict_targets(type(table))
         if not conflict_targets:
             raise ValueError("upsert requires primary key or unique index")
 
-        where_keys = set(where_payload.keys())
+        where_keys = where_payload.keys()
         conflict_target: tuple[str, ...] | None = None
-        for target in conflict_targets:
-            if set(target) == where_keys:
+        for target_columns, target in conflict_targets:
+            if target_columns == where_keys:
                 conflict_target = target
                 break
         if conflict_target is None:
@@ -204,18 +309,20 @@ class BackendBase(BackendProtocol, ABC):
         take: int | None = None,
         skip: int | None = None,
     ) -> list[ModelT]:
-        sql_table = self.table_cls(table.model.__name__)
-        if order_by:
-            sql_table = sql_table.as_("t")
         distinct_columns = self._normalize_distinct(table, distinct)
-        select_query, params = self._build_select_query(table, sql_table, where, order_by)
-
-        if skip is not None and not distinct_columns:
-            select_query = select_query.offset(skip)
-        if take is not None and not distinct_columns:
-            select_query = select_query.limit(take)
-
-        sql = self._render_query(select_query)
+        limit = None if distinct_columns else take
+        offset = None if distinct_columns else skip
+        plain_select = self._build_select_sql(table, where, order_by, limit, offset)
+        if plain_select is not None:
+            sql, params = plain_select
+        else:
+            sql_table, _ = self._select_source(table, aliased=bool(order_by))
+            select_query, params = self._build_select_query(table, sql_table, where, order_by)
+            if offset is not None:
+                select_query = select_query.offset(offset)
+            if limit is not None:
+                select_query = select_query.limit(limit)
+            sql = self._render_query(select_query)
         rows = self.query_raw(sql, params)
         row_list = list(rows)
         if distinct_columns:
@@ -225,7 +332,149 @@ class BackendBase(BackendProtocol, ABC):
             if take is not None:
                 row_list = row_list[:take]
         include_map = include or {}
-        return [self._materialize_instance(table, row, include_map) for row in row_list]
+        return self._materialize_instances(table, row_list, include_map)
+
+    def _build_select_sql(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        where: WhereT | None,
+        order_by: OrderByT | None,
+        take: int | None,
+        skip: int | None,
+    ) -> tuple[str, list[Any]] | None:
+        '''where 只含列的等值 / 比较 / IN 条件时直接拼接 SQL, 结果与 PyPika 渲染一致
+
+        其余形态 (其他运算符、关系、AND/OR/NOT、未知列) 返回 None, 交给 _build_select_query 处理并报错
+        '''
+        plain_where = self._plain_where(table, where)
+        if plain_where is None:
+            return None
+        conditions, params = plain_where
+
+        # SQL 文本只取决于 where 的条件形态以及排序, 按此缓存; LIMIT/OFFSET 每次追加
+        normalized_order_by = self._normalize_order_by(table, order_by)
+        key = (type(table), conditions, normalized_order_by)
+        sql = self._select_sql_cache.get(key)
+        if sql is None:
+            sql = self._render_select_sql(table, conditions, normalized_order_by)
+            self._select_sql_cache[key] = sql
+        if take is not None:
+            sql = f"{sql} LIMIT {take}"
+        if skip:
+            sql = f"{sql} OFFSET {skip}"
+        return f"{sql};", params
+
+    def _plain_where(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        where: Mapping[str, object] | None,
+    ) -> tuple[tuple[_PlainCondition, ...], list[Any]] | None:
+        '''拆出简单 where 的形态 ((列名, 运算符, 参数个数, 是否 JSON 绑定), ...) 与参数; 不是这种形态时返回 None
+
+        支持直接值 / None, 以及只含一个 EQ/LT/LTE/GT/GTE/IN/NOT_IN 运算符的过滤字典
+        '''
+        if not self.quote_char:
+            return None
+        conditions: list[_PlainCondition] = []
+        params: list[Any] = []
+        if where:
+            if not isinstance(where, Mapping):
+                return None
+            column_specs = table.column_specs_by_name
+            for column, value in where.items():
+                if column not in column_specs:
+                    return None
+                if _is_operator_mapping(type(value)):
+                    filters = cast(Mapping[str, Any], value)
+                    if len(filters) != 1:
+                        return None
+                    ((operator, value),) = filters.items()
+                    membership = _PLAIN_MEMBERSHIP.get(operator)
+                    if membership is not None:
+                        value_type = type(value)
+                        if value_type is not list and value_type is not tuple:
+                            return None
+                        if not value:
+                            return None
+                        threshold = self.json_in_threshold
+                        if threshold is not None and len(value) > threshold:
+                            payload = json_array_param(list(value), column_specs[column])
+                            if payload is not None:
+                                conditions.append((column, membership, 1, True))
+                                params.append(payload)
+                                continue
+                        if len(value) > _PLAIN_IN_LIMIT:
+                            return None
+                        conditions.append((column, membership, len(value), False))
+                        params.extend(value)
+                        continue
+                    comparison = _PLAIN_COMPARISONS.get(operator)
+                    if comparison is None:
+                        return None
+                    if value is not None or comparison != "=":
+                        conditions.append((column, comparison, 1, False))
+                        params.append(value)
+                        continue
+                if value is None:
+                    conditions.append((column, "IS NULL", 0, False))
+                else:
+                    conditions.append((column, "=", 1, False))
+                    params.append(value)
+        return tuple(conditions), params
+
+    def _render_plain_where(self, conditions: Sequence[_PlainCondition], prefix: str = "") -> str:
+        if not conditions:
+            return ""
+        quote = self.escape_identifier
+        token = self.parameter_token
+        rendered: list[str] = []
+        for column, operator, count, json_bound in conditions:
+            target = f"{prefix}{quote(column)}"
+            if operator == "IS NULL":
+                rendered.append(f"{target} IS NULL")
+            elif json_bound:
+                rendered.append(f"{target} {operator} (SELECT value FROM json_each({token}))")
+            elif count and operator in ("IN", "NOT IN"):
+                rendered.append(f"{target} {operator} ({','.join([token] * count)})")
+            else:
+                rendered.append(f"{target}{operator}{token}")
+        return " WHERE " + " AND ".join(rendered)
+
+    def _render_select_sql(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        conditions: Sequence[_PlainCondition],
+        order_by: tuple[tuple[str, Order], ...],
+    ) -> str:
+        quote = self.escape_identifier
+        prefix = f'{quote("t")}.' if order_by else ""
+        select_columns = ",".join(f"{prefix}{quote(spec.name)}" for spec in table.column_specs)
+        parts = [f"SELECT {select_columns} FROM {quote(table.model.__name__)}"]
+        if order_by:
+            parts.append(f' {quote("t")}')
+        parts.append(self._render_plain_where(conditions, prefix))
+        if order_by:
+            parts.append(
+                " ORDER BY " + ",".join(f"{prefix}{quote(column)} {order.value}" for column, order in order_by)
+            )
+        return "".join(parts)
+
+    def _select_source(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        *,
+        aliased: bool,
+    ) -> tuple[Table, tuple[Field, ...]]:
+        '''SELECT 用的 PyPika 表与字段只取决于表类和是否带别名 "t", 按此缓存复用'''
+        key = (type(table), aliased)
+        source = self._select_source_cache.get(key)
+        if source is None:
+            sql_table = self.table_cls(table.model.__name__)
+            if aliased:
+                sql_table = sql_table.as_("t")
+            source = (sql_table, tuple(sql_table.field(spec.name) for spec in table.column_specs))
+            self._select_source_cache[key] = source
+        return source
 
     def _build_select_query(
         self,
@@ -234,9 +483,8 @@ class BackendBase(BackendProtocol, ABC):
         where: WhereT | None,
         order_by: OrderByT | None,
     ) -> tuple[QueryBuilder, list[Any]]:
-        select_query: QueryBuilder = self.query_cls.from_(sql_table).select(
-            *[sql_table.field(spec.name) for spec in table.column_specs]
-        )
+        _, fields = self._select_source(table, aliased=sql_table.alias is not None)
+        select_query: QueryBuilder = self.query_cls.from_(sql_table).select(*fields)
         params: list[Any] = []
 
         if where:
@@ -260,6 +508,14 @@ class BackendBase(BackendProtocol, ABC):
         distinct: Sequence[str] | str | None = None,
         skip: int | None = None,
     ) -> ModelT | None:
+        if distinct is None:
+            plain_select = self._build_select_sql(table, where, order_by, 1, skip)
+            if plain_select is not None:
+                # 直接按 LIMIT 1 查询并只物化首行, 不经 find_many 的 distinct 归一化与列表推导
+                rows = self.query_raw(*plain_select)
+                if not rows:
+                    return None
+                return self._materialize_instance(table, rows[0], include or {})
         results = self.find_many(
             table,
             where=where,
@@ -277,17 +533,31 @@ class BackendBase(BackendProtocol, ABC):
         *,
         where: WhereT | None = None,
     ) -> int:
-        sql_table = self.table_cls(table.model.__name__)
-        query: QueryBuilder = self.query_cls.from_(sql_table).select(
-            Count("*").as_("__count")
-        )
-        params: list[object] = []
-        if where:
-            criterion, where_params = self._compile_where(table, sql_table, where)
-            if criterion is not None:
-                query = query.where(criterion)
-                params.extend(where_params)
-        rows = self.query_raw(self._render_query(query), params)
+        plain_where = self._plain_where(table, where)
+        if plain_where is not None:
+            conditions, params = plain_where
+            key = ("count", type(table), conditions)
+            sql = self._select_sql_cache.get(key)
+            if sql is None:
+                quote = self.escape_identifier
+                sql = (
+                    f'SELECT COUNT(*) {quote("__count")} FROM {quote(table.model.__name__)}'
+                    f"{self._render_plain_where(conditions)};"
+                )
+                self._select_sql_cache[key] = sql
+        else:
+            sql_table = self.table_cls(table.model.__name__)
+            query: QueryBuilder = self.query_cls.from_(sql_table).select(
+                Count("*").as_("__count")
+            )
+            params = []
+            if where:
+                criterion, where_params = self._compile_where(table, sql_table, where)
+                if criterion is not None:
+                    query = query.where(criterion)
+                    params.extend(where_params)
+            sql = self._render_query(query)
+        rows = self.query_raw(sql, params)
         if len(rows) != 1:
             raise RuntimeError(f"count() expected exactly 1 row, got {len(rows)}")
         value = rows[0]["__count"]
@@ -302,15 +572,19 @@ class BackendBase(BackendProtocol, ABC):
         where: WhereT,
         include: Mapping[str, bool] | None = None,
     ) -> ModelT | None:
-        sql_table = self.table_cls(table.model.__name__)
-        delete_query: QueryBuilder = self.query_cls.from_(sql_table).delete()
-        criterion, params = self._compile_where(table, sql_table, where)
-        if criterion is None:
-            raise ValueError("delete() requires a where clause, if you want to delete more rows use delete_many()")
-        delete_query = delete_query.where(criterion)
-        sql = self._render_query(delete_query)
-        returning_columns = [spec.name for spec in table.column_specs]
-        sql_with_returning = self._append_returning(sql, returning_columns)
+        plain_mutation = self._build_mutation_sql(table, (), where, returning=True) if where else None
+        if plain_mutation is not None:
+            sql_with_returning, params = plain_mutation
+        else:
+            sql_table = self.table_cls(table.model.__name__)
+            delete_query: QueryBuilder = self.query_cls.from_(sql_table).delete()
+            criterion, params = self._compile_where(table, sql_table, where)
+            if criterion is None:
+                raise ValueError("delete() requires a where clause, if you want to delete more rows use delete_many()")
+            delete_query = delete_query.where(criterion)
+            sql = self._render_query(delete_query)
+            returning_columns = [spec.name for spec in table.column_specs]
+            sql_with_returning = self._append_returning(sql, returning_columns)
         rows = self._execute_returning_transaction(
             sql_with_returning,
             params,
@@ -351,22 +625,26 @@ class BackendBase(BackendProtocol, ABC):
         where: WhereT | None = None,
         return_records: Literal[False, True] = False,
     ) -> int | list[ModelT]:
-        sql_table = self.table_cls(table.model.__name__)
-        delete_query: QueryBuilder = self.query_cls.from_(sql_table).delete()
-        params: list[Any] = []
+        plain_mutation = self._build_mutation_sql(table, (), where, returning=return_records)
+        if plain_mutation is not None:
+            sql, params = plain_mutation
+        else:
+            sql_table = self.table_cls(table.model.__name__)
+            delete_query: QueryBuilder = self.query_cls.from_(sql_table).delete()
+            params = []
 
-        if where:
-            criterion, where_params = self._compile_where(table, sql_table, where)
-            if criterion is not None:
-                delete_query = delete_query.where(criterion)
-                params.extend(where_params)
+            if where:
+                criterion, where_params = self._compile_where(table, sql_table, where)
+                if criterion is not None:
+                    delete_query = delete_query.where(criterion)
+                    params.extend(where_params)
 
-        sql = self._render_query(delete_query)
+            sql = self._render_query(delete_query)
+            if return_records:
+                sql = self._append_returning(sql, [spec.name for spec in table.column_specs])
 
         if return_records:
-            returning_columns = [spec.name for spec in table.column_specs]
-            sql_with_returning = self._append_returning(sql, returning_columns)
-            rows = self.query_raw(sql_with_returning, params, auto_commit=True)
+            rows = self.query_raw(sql, params, auto_commit=True)
             include_map: Mapping[str, bool] = {}
             return [self._materialize_instance(table, row, include_map) for row in rows]
 
@@ -405,41 +683,68 @@ class BackendBase(BackendProtocol, ABC):
         if not payload:
             raise ValueError("Update payload cannot be empty")
 
-        sql_table = self.table_cls(table.model.__name__)
-        update_query: QueryBuilder = self.query_cls.update(sql_table)
-        params: list[Any] = []
-        for column, value in payload.items():
-            update_query = update_query.set(sql_table.field(column), self.new_parameter())
-            params.append(value)
-
-        if where:
-            criterion, where_params = self._compile_where(table, sql_table, where)
-            if criterion is not None:
-                update_query = update_query.where(criterion)
-                params.extend(where_params)
-
-        sql = self._render_query(update_query)
+        plain_mutation = self._build_mutation_sql(table, tuple(payload), where, returning=return_records)
+        if plain_mutation is not None:
+            sql, where_params = plain_mutation
+            params: list[Any] = [*payload.values(), *where_params]
+        else:
+            sql_table = self.table_cls(table.model.__name__)
+            update_query: QueryBuilder = self.query_cls.update(sql_table)
+            params = []
+            for column, value in payload.items():
+                update_query = update_query.set(sql_table.field(column), self.new_parameter())
+                params.append(value)
+
+            if where:
+                criterion, where_params = self._compile_where(table, sql_table, where)
+                if criterion is not None:
+                    update_query = update_query.where(criterion)
+                    params.extend(where_params)
+
+            sql = self._render_query(update_query)
+            if return_records:
+                sql = self._append_returning(sql, [spec.name for spec in table.column_specs])
 
         if return_records:
-            returning_columns = [spec.name for spec in table.column_specs]
-            sql_with_returning = self._append_returning(sql, returning_columns)
-            rows = self.query_raw(sql_with_returning, params, auto_commit=True)
+            rows = self.query_raw(sql, params, auto_commit=True)
             include_map: Mapping[str, bool] = {}
             return [self._materialize_instance(table, row, include_map) for row in rows]
 
         affected = self.execute_raw(sql, params, auto_commit=True)
         return affected
 
-    def _fetch_single(
+    def _build_mutation_sql(
         self,
         table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
-        where: Mapping[str, object],
-        include: Mapping[str, bool] | None,
-    ) -> ModelT:
-        results = self.find_many(table, where=cast(WhereT, where), include=include)
-        if not results:
-            raise RuntimeError("Inserted row could not be reloaded")
-        return results[0]
+        set_columns: tuple[str, ...],
+        where: WhereT | None,
+        *,
+        returning: bool,
+    ) -> tuple[str, list[Any]] | None:
+        '''set_columns 非空时为 UPDATE, 否则为 DELETE; where 为简单条件时直接拼接 SQL, 结果与 PyPika 渲染一致
+
+        SQL 按 (表类, SET 列, where 形态, 是否 RETURNING) 缓存; 返回的参数只含 where 部分, SET 的值由调用方放在前面
+        '''
+        plain_where = self._plain_where(table, where)
+        if plain_where is None:
+            return None
+        conditions, params = plain_where
+
+        key = (type(table), set_columns, conditions, returning)
+        sql = self._mutation_sql_cache.get(key)
+        if sql is None:
+            quote = self.escape_identifier
+            if set_columns:
+                token = self.parameter_token
+                assignments = ",".join(f"{quote(column)}={token}" for column in set_columns)
+                head = f"UPDATE {quote(table.model.__name__)} SET {assignments}"
+            else:
+                head = f"DELETE FROM {quote(table.model.__name__)}"
+            sql = f"{head}{self._render_plain_where(conditions)};"
+            if returning:
+                sql = self._append_returning(sql, [spec.name for spec in table.column_specs])
+            self._mutation_sql_cache[key] = sql
+        return sql, params
 
     @abstractmethod
     def _begin_transaction(self) -> None:
@@ -475,13 +780,65 @@ class BackendBase(BackendProtocol, ABC):
         self._attach_relations(table, instance, include_map)
         return instance
 
+    def _materialize_instances(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        rows: Sequence[Mapping[str, Any]],
+        include_map: Mapping[str, bool],
+    ) -> list[ModelT]:
+        '''多行结果的 include 关系按关系批量预取: 每个关系一条 IN 查询, 而不是每行一条'''
+        relations = table.relations
+        if len(rows) < 2 or not relations or not any(include_map.values()):
+            return [self._materialize_instance(table, row, include_map) for row in rows]
+
+        instances = [cast(ModelT, table.deserialize_row(row)) for row in rows]
+        for relation in relations:
+            state = LazyRelationState(
+                attribute=relation.attribute,
+                backend=self,
+                table_cls=relation.resolve_remote_table(),
+                mapping=relation.mapping,
+                many=relation.many,
+            )
+            if include_map.get(relation.attribute):
+                self._prefetch_relation(state, instances)
+            else:
+                for instance in instances:
+                    state.bind(instance)
+        return instances
+
+    def _prefetch_relation(self, state: LazyRelationState, instances: Sequence[Any]) -> None:
+        if len(state.mapping) != 1:
+            # 复合键关系无法用单列 IN 表达, 仍逐行加载
+            for instance in instances:
+                state.materialize(instance)
+            return
+
+        ((local_column, remote_column),) = state.mapping.items()
+        keys = [getattr(instance, local_column) for instance in instances]
+        values = [key for key in dict.fromkeys(keys) if key is not None]
+        remote_table = state.table_cls(self)
+        grouped: dict[object, list[Any]] = {}
+        step = self.max_variable_number
+        for start in range(0, len(values), step):
+            where = {remote_column: {"IN": values[start:start + step]}}
+            for remote in self.find_many(remote_table, where=cast(Any, where)):
+                grouped.setdefault(getattr(remote, remote_column), []).append(remote)
+
+        for instance, key in zip(instances, keys):
+            ensure_lazy_descriptor(instance.__class__, state.attribute, state.many)
+            matched = grouped.get(key) if key is not None else None
+            if state.many:
+                setattr(instance, state.attribute, list(matched) if matched else [])
+            else:
+                setattr(instance, state.attribute, matched[0] if matched else None)
+
     def _attach_relations(
         self,
         table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
         instance: ModelT,
         include_map: Mapping[str, bool],
     ) -> None:
-        include_lookup = dict(include_map)
         relations = table.relations
         if not relations:
             return
@@ -491,11 +848,11 @@ class BackendBase(BackendProtocol, ABC):
             state = LazyRelationState(
                 attribute=name,
                 backend=self,
-                table_cls=relation.remote_table(),
+                table_cls=relation.resolve_remote_table(),
                 mapping=relation.mapping,
                 many=relation.many,
             )
-            if include_lookup.get(name):
+            if include_map.get(name):
                 state.materialize(instance)
             else:
                 state.bind(instance)
@@ -529,8 +886,8 @@ class BackendBase(BackendProtocol, ABC):
         return criterion, compiler.params
 
     def _log_sql(self, sql: str, params: Sequence[object] | None) -> None:
-        params_seq = list(params) if params is not None else []
-        push_sql(sql, params_seq, echo=self._echo_sql)
+        # 只有在记录或回显 SQL 时 push_sql 才会复制参数
+        push_sql(sql, params if params is not None else (), echo=self._echo_sql)
 
     def _normalize_distinct(
         self,
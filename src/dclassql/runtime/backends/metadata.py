@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable, Literal, Mapping
 
 
@@ -20,3 +20,11 @@ class TableRelation[TTable]:
     remote_table: Callable[[], type[TTable]]
     many: bool
     mapping: Mapping[str, str]
+    _remote_table_cls: type[TTable] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def resolve_remote_table(self) -> type[TTable]:
+        '''remote_table 是为前向引用准备的 lambda; 首次解析后缓存, 逐行挂载关系时不再重复调用'''
+        table_cls = self._remote_table_cls
+        if table_cls is None:
+            table_cls = self._remote_table_cls = self.remote_table()
+        return table_cls
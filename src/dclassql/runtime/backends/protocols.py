@@ -17,6 +17,8 @@ ConnectionFactory = Callable[[], sqlite3.Connection]
 @runtime_checkable
 class SchemaTableProtocol(Protocol):
     '''描述生成客户端表时需要的信息'''
+    __slots__ = ()
+
     table_name: str
     column_specs: tuple[ColumnSpec, ...]
     primary_key: tuple[str, ...]
@@ -27,6 +29,9 @@ class SchemaTableProtocol(Protocol):
 @runtime_checkable
 class TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT](SchemaTableProtocol, Protocol):
     '''描述使用表时需要的信息'''
+    # 生成的表类只在实例上保存 _backend, 基类不能引入 __dict__
+    __slots__ = ()
+
     def __init__(self, backend: BackendProtocol) -> None: ...
 
     model: type[ModelT]
@@ -53,6 +58,7 @@ class BackendProtocol(Protocol):
     table_cls: type[Table]
     parameter_cls: type[Parameter]
     like_escape_char: str | None
+    json_in_threshold: int | None
 
     def insert(
         self,
@@ -77,14 +83,25 @@ class BackendProtocol(Protocol):
         include: IncludeT | None = None,
     ) -> ModelT: ...
 
+    @overload
     def insert_many(
         self,
         table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
         data: Sequence[InsertT | ModelT | Mapping[str, object]],
         *,
         batch_size: int | None = None,
+        return_records: Literal[True] = True,
     ) -> list[ModelT]: ...
     @overload
+    def insert_many(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        data: Sequence[InsertT | ModelT | Mapping[str, object]],
+        *,
+        batch_size: int | None = None,
+        return_records: Literal[False],
+    ) -> int: ...
+    @overload
     def update_many(
         self,
         table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
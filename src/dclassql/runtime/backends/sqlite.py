@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import sqlite3
 import threading
-from typing import Any, Literal, Mapping, Sequence, overload
+from itertools import batched, chain
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Literal, Mapping, Sequence, overload
 
 from pypika import analytics as an
 from pypika.dialects import SQLLiteQuery
 from pypika.enums import Order
 from pypika.queries import QueryBuilder
 
+from dclassql.runtime.datasource import close_sqlite_connection
+from dclassql.runtime.sql_recorder import is_recording
 from dclassql.typing import IncludeT, InsertT, ModelT, OrderByT, WhereT
 from dclassql.utils.ensure import ensure_sqlite_row_factory
 
@@ -18,79 +22,143 @@ from .protocols import ConnectionFactory, TableProtocol
 
 class SQLiteBackend(BackendBase):
     query_cls = SQLLiteQuery
+    max_variable_number = 32766
+    '''单条语句可绑定参数的上限 (SQLITE_MAX_VARIABLE_NUMBER, 3.32+ 默认值)'''
+    json_in_threshold = 8
     _single_row_mutation_savepoint = "dclassql_single_row_mutation"
 
-    def __init__(self, source: sqlite3.Connection | ConnectionFactory | "SQLiteBackend", *, echo_sql: bool = False) -> None:
+    def __init__(
+        self,
+        source: sqlite3.Connection | ConnectionFactory | "SQLiteBackend",
+        *,
+        echo_sql: bool = False,
+        pragmas: Mapping[str, str | int] | None = None,
+    ) -> None:
+        '''`pragmas` 会在每个连接首次被后端使用时执行一次, 例如
+        `{"journal_mode": "WAL", "synchronous": "NORMAL"}`. 生成的 Client 已经在
+        打开连接时设置了 WAL 等参数, 这里主要用于直接传入连接或工厂的场景.'''
         super().__init__(echo_sql=echo_sql)
         if isinstance(source, SQLiteBackend):
             self._factory: ConnectionFactory | None = source._factory
             self._connection: sqlite3.Connection | None = source._connection
             self._local = source._local
             self._echo_sql = source._echo_sql
+            self._pragmas: Mapping[str, str | int] = source._pragmas
         elif isinstance(source, sqlite3.Connection):
             self._factory = None
             self._connection = source
+            self._pragmas = dict(pragmas or {})
             ensure_sqlite_row_factory(self._connection)
+            self._apply_pragmas(self._connection)
             self._local = threading.local()
         elif callable(source):
             self._factory = source
             self._connection = None
+            self._pragmas = dict(pragmas or {})
             self._local = threading.local()
         else:
             raise TypeError("SQLite backend source must be connection or callable returning connection")
 
+    @overload
     def insert_many(
         self,
         table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
         data: Sequence[InsertT | Mapping[str, object]],
         *,
         batch_size: int | None = None,
-    ) -> list[ModelT]:
-        items = list(data)
-        if not items:
-            return []
+        return_records: Literal[True] = True,
+    ) -> list[ModelT]: ...
+    @overload
+    def insert_many(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        data: Sequence[InsertT | Mapping[str, object]],
+        *,
+        batch_size: int | None = None,
+        return_records: Literal[False],
+    ) -> int: ...
 
+    def insert_many(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        data: Sequence[InsertT | Mapping[str, object]],
+        *,
+        batch_size: int | None = None,
+        return_records: Literal[False, True] = True,
+    ) -> list[ModelT] | int:
         payloads: list[dict[str, object]] = []
         payload_columns = set[str]()
         column_names: list[str] = []
-        for item in items:
+        for item in data:
             payload = table.serialize_insert(item)
             payloads.append(payload)
+            # 同构数据的列都已登记过, 用一次 C 层的集合判断跳过逐列检查
+            if payload_columns.issuperset(payload):
+                continue
             for column in payload:
                 if column not in payload_columns:
                     payload_columns.add(column)
                     column_names.append(column)
+        if not payloads:
+            return [] if return_records else 0
         if not column_names:
             raise ValueError("Insert payload cannot be empty")
 
-        sql_table = self.table_cls(table.model.__name__)
-        results: list[ModelT] = []
-        step = batch_size if batch_size and batch_size > 0 else len(payloads)
-        start = 0
+        insert_columns = tuple(column_names)
+        column_count = len(insert_columns)
+        if column_count > 1 and all(len(payload) == column_count for payload in payloads):
+            # 每行都含全部列时用 itemgetter 一次取出整行的值
+            row_values: Callable[[dict[str, object]], Iterable[object]] = itemgetter(*insert_columns)
+        else:
+            row_values = lambda payload: [payload.get(column) for column in insert_columns]
         connection = self._acquire_connection()
-        while start < len(payloads):
-            end = min(start + step, len(payloads))
-            subset_payloads = payloads[start:end]
-            if not subset_payloads:
-                break
-            insert_query: QueryBuilder = self.query_cls.into(sql_table).columns(*column_names)
-            params: list[Any] = []
-            for payload in subset_payloads:
-                insert_query = insert_query.insert(*(self.new_parameter() for _ in column_names))
-                params.extend(payload.get(column) for column in column_names)
-            sql = self._render_query(insert_query)
-            sql_with_returning = self._append_returning(sql, [spec.name for spec in table.column_specs])
-            rows = self._execute_sql(connection, sql_with_returning, params, fetch=True, auto_commit=True)
-            if len(rows) != len(subset_payloads):
-                raise RuntimeError("Inserted rows mismatch returning rows")
-            include_map: Mapping[str, bool] = {}
-            for row in rows:
-                instance = self._materialize_instance(table, dict(row), include_map)
-                results.append(instance)
-            start = end
+        if not return_records:
+            # 不需要回读记录时, 同一条单行 INSERT 交给 executemany 逐行绑定, 无需拼接多行 VALUES
+            sql = self._insert_values_sql(table, insert_columns)
+            self._begin_transaction()
+            try:
+                self._execute_many(connection, sql, [row_values(payload) for payload in payloads])
+            except BaseException:
+                self._rollback_transaction()
+                raise
+            self._commit_transaction()
+            return len(payloads)
+
+        results: list[ModelT] = []
+        # 多行 VALUES 的参数总数不能超过 SQLite 的上限, 超出时缩小每批行数;
+        # 以连接上实际生效的上限为准, 旧版本编译的 SQLite 可能只有 999
+        variable_limit = min(
+            self.max_variable_number,
+            connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER),
+        )
+        # 未指定 batch_size 时整批行数取上限而不是 len(payloads): 只有整批的 SQL 入缓存,
+        # 行数随调用变化的尾批不缓存, 缓存条目数不随 insert_many 的长度增长
+        step = batch_size if batch_size and batch_size > 0 else variable_limit
+        step = max(1, min(step, variable_limit // column_count))
+        include_map: Mapping[str, bool] = {}
+        # 所有批次共用一个事务: 只在最后提交一次, 任一批失败则整体回滚
+        self._begin_transaction()
+        try:
+            # batched 逐批切出元组视图, 参数只为当前批次展开, 不再复制整份 payloads
+            for batch in batched(payloads, step):
+                params = list(chain.from_iterable(map(row_values, batch)))
+                sql_with_returning = self._insert_returning_sql(
+                    table, insert_columns, len(batch), cache=len(batch) == step
+                )
+                rows = self._execute_sql(connection, sql_with_returning, params, fetch=True, auto_commit=False)
+                if len(rows) != len(batch):
+                    raise RuntimeError("Inserted rows mismatch returning rows")
+                for row in rows:
+                    results.append(self._materialize_instance(table, row, include_map))
+        except BaseException:
+            self._rollback_transaction()
+            raise
+        self._commit_transaction()
         return results
 
     def _acquire_connection(self) -> sqlite3.Connection:
+        # 工厂模式下每个线程持有自己的连接: WAL 下多个线程的读互不阻塞, 写由 SQLite 的文件锁串行化.
+        # 不再单独拆分只读连接, 否则调用方事务 (SAVEPOINT) 内的读取将看不到尚未提交的写入.
         if self._factory is None:
             assert self._connection is not None
             ensure_sqlite_row_factory(self._connection)
@@ -102,23 +170,28 @@ class SQLiteBackend(BackendBase):
             if not isinstance(connection, sqlite3.Connection):
                 raise TypeError("SQLite backend factory must return sqlite3.Connection")
             ensure_sqlite_row_factory(connection)
+            self._apply_pragmas(connection)
             self._local.connection = connection
         return connection
 
+    def _apply_pragmas(self, connection: sqlite3.Connection) -> None:
+        for name, value in self._pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+
     def close(self) -> None:
         if self._factory is None:
             if self._connection is not None:
-                self._connection.close()
+                close_sqlite_connection(self._connection)
                 self._connection = None
             return
         connection = getattr(self._local, "connection", None)
         if connection is not None:
-            connection.close()
+            close_sqlite_connection(connection)
             delattr(self._local, "connection")
 
     def query_raw(self, sql: str, params: Sequence[object] | None = None, auto_commit: bool = False) -> Sequence[dict[str, object]]:
         connection = self._acquire_connection()
-        return [dict(row) for row in self._execute_sql(connection, sql, params, fetch=True, auto_commit=auto_commit)]
+        return self._execute_sql(connection, sql, params, fetch=True, auto_commit=auto_commit)
 
     def execute_raw(self, sql: str, params: Sequence[object] | None = None, auto_commit: bool = True) -> int:
         connection = self._acquire_connection()
@@ -129,20 +202,30 @@ class SQLiteBackend(BackendBase):
         self._acquire_connection().execute(
             f"SAVEPOINT {self._single_row_mutation_savepoint}"
         )
+        self._local.transaction_depth = self._transaction_depth() + 1
 
     def _commit_transaction(self) -> None:
-        self._acquire_connection().execute(
-            f"RELEASE SAVEPOINT {self._single_row_mutation_savepoint}"
-        )
+        try:
+            self._acquire_connection().execute(
+                f"RELEASE SAVEPOINT {self._single_row_mutation_savepoint}"
+            )
+        finally:
+            self._local.transaction_depth = self._transaction_depth() - 1
 
     def _rollback_transaction(self) -> None:
         connection = self._acquire_connection()
-        connection.execute(
-            f"ROLLBACK TO SAVEPOINT {self._single_row_mutation_savepoint}"
-        )
-        connection.execute(
-            f"RELEASE SAVEPOINT {self._single_row_mutation_savepoint}"
-        )
+        try:
+            connection.execute(
+                f"ROLLBACK TO SAVEPOINT {self._single_row_mutation_savepoint}"
+            )
+            connection.execute(
+                f"RELEASE SAVEPOINT {self._single_row_mutation_savepoint}"
+            )
+        finally:
+            self._local.transaction_depth = self._transaction_depth() - 1
+
+    def _transaction_depth(self) -> int:
+        return getattr(self._local, "transaction_depth", 0)
 
     def find_many(
         self,
@@ -167,9 +250,13 @@ class SQLiteBackend(BackendBase):
                 skip=skip,
             )
 
-        sql_table = self.table_cls(table.model.__name__)
-        if order_by:
-            sql_table = sql_table.as_("t")
+        plain_select = self._build_distinct_sql(table, distinct_columns, where, order_by, take, skip)
+        if plain_select is not None:
+            sql, params = plain_select
+            rows = self.query_raw(sql, params)
+            return self._materialize_instances(table, rows, include or {})
+
+        sql_table, _ = self._select_source(table, aliased=bool(order_by))
         # 基础查询不带 order_by，方便后续在窗口与外层统一处理
         base_query, params = self._build_select_query(table, sql_table, where, None)
 
@@ -204,8 +291,74 @@ class SQLiteBackend(BackendBase):
         sql = outer_query.get_sql(quote_char=self.quote_char) + ";"
         rows = self.query_raw(sql, params)
         include_map = include or {}
-        return [self._materialize_instance(table, row, include_map) for row in rows]
+        return self._materialize_instances(table, rows, include_map)
+
+    def _build_distinct_sql(
+        self,
+        table: TableProtocol[ModelT, InsertT, WhereT, IncludeT, OrderByT],
+        distinct_columns: Sequence[str],
+        where: WhereT | None,
+        order_by: OrderByT | None,
+        take: int | None,
+        skip: int | None,
+    ) -> tuple[str, list[Any]] | None:
+        '''简单 where 下的 ROW_NUMBER() 去重查询, 文本与 PyPika 渲染一致
 
+        SQL 按 (where 形态, 去重列, 排序) 缓存, LIMIT/OFFSET 每次追加; 其余 where 返回 None
+        '''
+        plain_where = self._plain_where(table, where)
+        if plain_where is None:
+            return None
+        conditions, params = plain_where
+
+        normalized_order_by = self._normalize_order_by(table, order_by)
+        key = ("distinct", type(table), conditions, tuple(distinct_columns), normalized_order_by)
+        sql = self._select_sql_cache.get(key)
+        if sql is None:
+            quote = self.escape_identifier
+            prefix = f'{quote("t")}.' if normalized_order_by else ""
+            window_order = normalized_order_by or tuple((col, Order.asc) for col in distinct_columns)
+            select_columns = ",".join(f"{prefix}{quote(spec.name)}" for spec in table.column_specs)
+            partition = ",".join(f"{prefix}{quote(col)}" for col in distinct_columns)
+            window = ",".join(f"{prefix}{quote(col)} {order.value}" for col, order in window_order)
+            source = quote(table.model.__name__)
+            if normalized_order_by:
+                source = f'{source} {quote("t")}'
+            inner = (
+                f"SELECT {select_columns},ROW_NUMBER() OVER(PARTITION BY {partition} ORDER BY {window}) "
+                f'{quote("rn")} FROM {source}{self._render_plain_where(conditions, prefix)}'
+            )
+            sub = quote("__d")
+            sql = f'SELECT {sub}.* FROM ({inner}) {sub} WHERE {sub}.{quote("rn")}=1'
+            if normalized_order_by:
+                sql += " ORDER BY " + ",".join(
+                    f"{sub}.{quote(col)} {order.value}" for col, order in normalized_order_by
+                )
+            self._select_sql_cache[key] = sql
+        if take is not None:
+            sql = f"{sql} LIMIT {take}"
+        elif skip is not None:
+            sql = f"{sql} LIMIT -1"
+        if skip:
+            sql = f"{sql} OFFSET {skip}"
+        return f"{sql};", params
+
+    def _execute_many(
+        self,
+        connection: sqlite3.Connection,
+        sql: str,
+        rows: Sequence[Iterable[object]],
+    ) -> int:
+        # 逐行记录需要把每行参数转成元组, 只在 record_sql 或 echo 生效时才做
+        if self._echo_sql or is_recording():
+            for row in rows:
+                self._log_sql(sql, tuple(row))
+        cursor = connection.cursor()
+        try:
+            cursor.executemany(sql, rows)
+            return cursor.rowcount
+        finally:
+            cursor.close()
 
     @overload
     def _execute_sql(
@@ -216,7 +369,7 @@ class SQLiteBackend(BackendBase):
         *,
         fetch: Literal[True],
         auto_commit: bool,
-    ) -> Sequence[sqlite3.Row]: ...
+    ) -> list[dict[str, object]]: ...
     @overload
     def _execute_sql(
         self,
@@ -236,16 +389,23 @@ class SQLiteBackend(BackendBase):
         *,
         fetch: bool,
         auto_commit: bool,
-    ) -> Sequence[sqlite3.Row] | int:
-        parameters = tuple(params) if params is not None else ()
+    ) -> list[dict[str, object]] | int:
+        # sqlite3 直接接受 list/tuple, 无需再复制成元组
+        parameters = params if params is not None else ()
         self._log_sql(sql, parameters)
-        cursor = connection.execute(sql, parameters)
+        # 绕过 sqlite3.Row: 取普通元组后按列位置与 description 中的列名配对
+        cursor = connection.cursor()
+        cursor.row_factory = None
         try:
+            cursor.execute(sql, parameters)
             if fetch:
-                rows = cursor.fetchall()
+                description = cursor.description or ()
+                names = [column[0] for column in description]
+                rows = [dict(zip(names, values)) for values in cursor.fetchall()]
             else:
                 rows = cursor.rowcount
-            if auto_commit:
+            # 处于 SAVEPOINT 内时由最外层 RELEASE 统一提交, commit() 会提前结束整个事务
+            if auto_commit and not self._transaction_depth():
                 connection.commit()
         finally:
             cursor.close()
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import json
 from collections.abc import Mapping as ABCMapping
-from typing import Mapping, Sequence, cast
+from functools import cache
+from types import UnionType
+from typing import Any, Mapping, Sequence, cast, get_args
 
 from pypika import Query, Table
 from pypika.queries import QueryBuilder
-from pypika.terms import Criterion, ExistsCriterion, Field, Not, Parameter
+from pypika.terms import Criterion, ExistsCriterion, Field, Not, Parameter, Term
 
 from dclassql.typing import IncludeT, InsertT, ModelT, OrderByT, WhereT
 from dclassql.utils.ensure import ensure_sequence, ensure_string
 
+from .metadata import ColumnSpec
 from .protocols import BackendProtocol, TableProtocol, TableRelation
 
 
@@ -33,6 +37,49 @@ def combine_or(criteria: Sequence[Criterion | None]) -> Criterion | None:
     return result
 
 
+@cache
+def _relations_by_attribute(table_cls: type[Any]) -> Mapping[str, TableRelation[TableProtocol]]:
+    '''relations 是生成表类上的类属性, 按类预先建好 attribute -> relation 的索引'''
+    return {relation.attribute: relation for relation in table_cls.relations}
+
+
+@cache
+def _json_scalar_type(python_type: Any) -> type | None:
+    '''列的 Python 类型为 int / str (可为 Optional) 时返回该类型, 否则返回 None'''
+    arms = [arm for arm in get_args(python_type) if arm is not type(None)] if type(python_type) is UnionType else [python_type]
+    if len(arms) == 1 and (arms[0] is int or arms[0] is str):
+        return arms[0]
+    return None
+
+
+def json_array_param(values: Sequence[object], column: ColumnSpec) -> str | None:
+    '''IN 列表可整体绑定为 JSON 数组时返回其文本, 否则返回 None
+
+    json_each 取出的值不参与列亲和性转换 (如 TEXT 列与 int 值比较), 只有列为 int / str 且
+    每个元素的类型都与之一致时, 结果才与逐项展开的 `IN (?,?)` 相同
+    '''
+    if column.storage_kind != "scalar":
+        return None
+    column_type = _json_scalar_type(column.python_type)
+    if column_type is None:
+        return None
+    for value in values:
+        if type(value) is not column_type:
+            return None
+    return json.dumps(values)
+
+
+class JsonEachTerm(Term):
+    '''`(SELECT value FROM json_each(?))`: 整个 IN 列表绑定为一个参数, SQL 文本不随列表长度变化'''
+
+    def __init__(self, parameter: Parameter) -> None:
+        super().__init__()
+        self._parameter = parameter
+
+    def get_sql(self, **kwargs: Any) -> str:
+        return f"(SELECT value FROM json_each({self._parameter.get_sql(**kwargs)}))"
+
+
 class EscapeLikeCriterion(Criterion):
     def __init__(self, field: Field, parameter: Parameter, *, escape: str, negated: bool = False) -> None:
         self._field = field
@@ -55,6 +102,8 @@ class EscapeLikeCriterion(Criterion):
 
 
 class WhereCompiler:
+    __slots__ = ("_backend", "_table", "_sql_table", "params", "_relation_map")
+
     def __init__(
         self,
         backend: BackendProtocol,
@@ -65,9 +114,7 @@ class WhereCompiler:
         self._table = table
         self._sql_table = sql_table
         self.params: list[object] = []
-        self._relation_map: dict[str, TableRelation[TableProtocol]] = {
-            relation.attribute: relation for relation in table.relations
-        }
+        self._relation_map = _relations_by_attribute(type(table))
 
     def compile(self, where: Mapping[str, object]) -> Criterion | None:
         if not isinstance(where, ABCMapping):
@@ -159,14 +206,12 @@ class WhereCompiler:
             values = ensure_sequence(operand, label="IN")
             if not values:
                 return (field == field).negate()
-            params = tuple(self._bind_value(item) for item in values)
-            return field.isin(params)
+            return field.isin(self._bind_values(field, values))
         if operator == "NOT_IN":
             values = ensure_sequence(operand, label="NOT_IN")
             if not values:
                 return field == field
-            params = tuple(self._bind_value(item) for item in values)
-            return field.notin(params)
+            return field.notin(self._bind_values(field, values))
         if operator == "LT":
             return field < self._bind_value(operand)
         if operator == "LTE":
@@ -217,6 +262,14 @@ class WhereCompiler:
         self.params.append(value)
         return parameter
 
+    def _bind_values(self, field: Field, values: list[object]) -> tuple[Parameter, ...] | JsonEachTerm:
+        threshold = self._backend.json_in_threshold
+        if threshold is not None and len(values) > threshold:
+            payload = json_array_param(values, self._table.column_specs_by_name[field.name])
+            if payload is not None:
+                return JsonEachTerm(self._bind_value(payload))
+        return tuple(self._bind_value(item) for item in values)
+
     def _compile_relation(
         self,
         relation: TableRelation[TableProtocol],
@@ -316,7 +369,7 @@ class WhereCompiler:
         self,
         relation: TableRelation[TableProtocol],
     ) -> tuple[QueryBuilder, Table, TableProtocol]:
-        remote_instance = relation.remote_table()(self._backend)
+        remote_instance = relation.resolve_remote_table()(self._backend)
         remote_table = Table(remote_instance.table_name)
         query = Query.from_(remote_table).select(1)
         for local_column, remote_column in relation.mapping.items():
@@ -7,6 +7,10 @@ from urllib.parse import urlparse
 
 from .sqlite_adapters import register_sqlite_adapters
 
+SQLITE_CACHED_STATEMENTS = 1024
+'''sqlite3 预编译语句 LRU 的容量 (默认 128). 生成的 SQL 形态较多, 调大以免重复编译 VDBE.
+外部传入的连接无法在连接后修改该值, 需自行在 connect 时指定.'''
+
 def resolve_sqlite_path(url: str) -> str:
     parsed = urlparse(url)
     if parsed.scheme != "sqlite":
@@ -39,4 +43,15 @@ def open_sqlite_connection(url: str) -> sqlite3.Connection:
         path,
         check_same_thread=False,
         detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+        cached_statements=SQLITE_CACHED_STATEMENTS,
     )
+
+
+def close_sqlite_connection(connection: sqlite3.Connection) -> None:
+    '''关闭连接; 本连接有过写入 (total_changes 非零) 时先执行 PRAGMA optimize 刷新查询规划统计, 纯读连接直接关闭'''
+    try:
+        if connection.total_changes:
+            connection.execute("PRAGMA optimize;")
+    except sqlite3.Error:
+        pass
+    connection.close()
@@ -34,6 +34,11 @@ def record_sql(echo: bool = False):
     return _manager()
 
 
+def is_recording() -> bool:
+    '''当前上下文是否有 record_sql 在记录; 供需要逐条展开参数才能记录的路径提前判断'''
+    return _current_recorder.get() is not None
+
+
 def push_sql(sql: str, params: Sequence[Any], *, echo: bool) -> None:
     recorder = _current_recorder.get()
     rec_echo = False
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from types import MappingProxyType
 from typing import Annotated, Any, Literal, Mapping, Sequence, NotRequired, Never, overload
 from typing_extensions import TypedDict
 
@@ -15,6 +14,9 @@ from dclassql.runtime.json_value import deserialize_json_value, serialize_json_v
 from datetime import datetime
 from tests.test_codegen import Address, BirthDay, Book, Composite, User, UserBook, UserStatus, UserType, UserVIPLevel
 
+# 所有表与 Client 共用同一个数据源配置实例
+_DATASOURCE = DataSourceConfig(url='sqlite:///analytics.db', name=None)
+
 class DateTimeFilter(TypedDict, total=False, closed=True):
     EQ: datetime | None
     IN: Sequence[datetime]
@@ -117,13 +119,17 @@ class AddressTable(TableProtocol):
     model = Address
     insert_model = AddressInsert
     table_name: str = 'Address'
-    datasource = DataSourceConfig(url='sqlite:///analytics.db', name=None)
+    datasource = _DATASOURCE
     column_specs: tuple[ColumnSpec, ...] = (
         ColumnSpec(name='id', python_type=int, storage_kind='scalar', nullable=False, auto_increment=True),
         ColumnSpec(name='location', python_type=str, storage_kind='scalar', nullable=False, auto_increment=False),
         ColumnSpec(name='user_id', python_type=int, storage_kind='scalar', nullable=False, auto_increment=False),
     )
-    column_specs_by_name: Mapping[str, ColumnSpec] = MappingProxyType({spec.name: spec for spec in column_specs})
+    column_specs_by_name: Mapping[str, ColumnSpec] = {
+        'id': column_specs[0],
+        'location': column_specs[1],
+        'user_id': column_specs[2],
+    }
     primary_key: tuple[str] = ('id',)
 
     indexes: tuple[tuple[str, ...], ...] = ()
@@ -139,14 +145,8 @@ class AddressTable(TableProtocol):
 
     @classmethod
     def serialize_insert(cls, data: AddressInsert | Address | Mapping[str, object]) -> dict[str, object]:
-        if isinstance(data, Mapping):
+        if type(data) is dict or isinstance(data, Mapping):
             result = dict(data)
-            if 'id' in data:
-                result['id'] = data['id']
-            if 'location' in data:
-                result['location'] = data['location']
-            if 'user_id' in data:
-                result['user_id'] = data['user_id']
             return result
         if isinstance(data, (AddressInsert, Address)):
             return {
@@ -171,6 +171,8 @@ class AddressTable(TableProtocol):
         instance.user = None # type: ignore[attr-defined]
         return instance
 
+    __slots__ = ("_backend",)
+
     def __init__(self, backend: BackendProtocol) -> None:
         self._backend = backend
 
@@ -180,8 +182,12 @@ class AddressTable(TableProtocol):
     def insert(self, data: AddressInsert | Address | AddressInsertDict) -> Address:
         return self._backend.insert(self, data)
 
-    def insert_many(self, data: Sequence[AddressInsert | Address | AddressInsertDict], *, batch_size: int | None = None) -> list[Address]:
-        return self._backend.insert_many(self, data, batch_size=batch_size)
+    @overload
+    def insert_many(self, data: Sequence[AddressInsert | Address | AddressInsertDict], *, batch_size: int | None = None, return_records: Literal[True] = True) -> list[Address]: ...
+    @overload
+    def insert_many(self, data: Sequence[AddressInsert | Address | AddressInsertDict], *, batch_size: int | None = None, return_records: Literal[False]) -> int: ...
+    def insert_many(self, data: Sequence[AddressInsert | Address | AddressInsertDict], *, batch_size: int | None = None, return_records: Literal[False, True] = True) -> list[Address] | int:
+        return self._backend.insert_many(self, data, batch_size=batch_size, return_records=return_records)
 
     def update(self, *, data: AddressUpdateDict, where: AddressWhereDict, include: AddressIncludeDict | None = None) -> Address:
         return self._backend.update(self, data=data, where=where, include=include)
@@ -284,12 +290,15 @@ class BirthDayTable(TableProtocol):
     model = BirthDay
     insert_model = BirthDayInsert
     table_name: str = 'BirthDay'
-    datasource = DataSourceConfig(url='sqlite:///analytics.db', name=None)
+    datasource = _DATASOURCE
     column_specs: tuple[ColumnSpec, ...] = (
         ColumnSpec(name='user_id', python_type=int, storage_kind='scalar', nullable=False, auto_increment=False),
         ColumnSpec(name='date', python_type=datetime, storage_kind='scalar', nullable=False, auto_increment=False),
     )
-    column_specs_by_name: Mapping[str, ColumnSpec] = MappingProxyType({spec.name: spec for spec in column_specs})
+    column_specs_by_name: Mapping[str, ColumnSpec] = {
+        'user_id': column_specs[0],
+        'date': column_specs[1],
+    }
     primary_key: tuple[str] = ('user_id',)
 
     indexes: tuple[tuple[str, ...], ...] = ()
@@ -305,12 +314,8 @@ class BirthDayTable(TableProtocol):
 
     @classmethod
     def serialize_insert(cls, data: BirthDayInsert | BirthDay | Mapping[str, object]) -> dict[str, object]:
-        if isinstance(data, Mapping):
+        if type(data) is dict or isinstance(data, Mapping):
             result = dict(data)
-            if 'user_id' in data:
-                result['user_id'] = data['user_id']
-            if 'date' in data:
-                result['date'] = data['date']
             return result
         if isinstance(data, (BirthDayInsert, BirthDay)):
             return {
@@ -333,6 +338,8 @@ class BirthDayTable(TableProtocol):
         instance.date = row['date'] # type: ignore[attr-defined]
         return instance
 
+    __slots__ = ("_backend",)
+
     def __init__(self, backend: BackendProtocol) -> None:
         self._backend = backend
 
@@ -342,8 +349,12 @@ class BirthDayTable(TableProtocol):
     def insert(self, data: BirthDayInsert | BirthDay | BirthDayInsertDict) -> BirthDay:
         return self._backend.insert(self, data)
 
-    def insert_many(self, data: Sequence[BirthDayInsert | BirthDay | BirthDayInsertDict], *, batch_size: int | None = None) -> list[BirthDay]:
-        return self._backend.insert_many(self, data, batch_size=batch_size)
+    @overload
+    def insert_many(self, data: Sequence[BirthDayInsert | BirthDay | BirthDayInsertDict], *, batch_size: int | None = None, return_records: Literal[True] = True) -> list[BirthDay]: ...
+    @overload
+    def insert_many(self, data: Sequence[BirthDayInsert | BirthDay | BirthDayInsertDict], *, batch_size: int | None = None, return_records: Literal[False]) -> int: ...
+    def insert_many(self, data: Sequence[BirthDayInsert | BirthDay | BirthDayInsertDict], *, batch_size: int | None = None, return_records: Literal[False, True] = True) -> list[BirthDay] | int:
+        return self._backend.insert_many(self, data, batch_size=batch_size, return_records=return_records)
 
     def update(self, *, data: BirthDayUpdateDict, where: BirthDayWhereDict, include: BirthDayIncludeDict | None = None) -> BirthDay:
         return self._backend.update(self, data=data, where=where, include=include)
@@ -447,12 +458,15 @@ class BookTable(TableProtocol):
     model = Book
     insert_model = BookInsert
     table_name: str = 'Book'
-    datasource = DataSourceConfig(url='sqlite:///analytics.db', name=None)
+    datasource = _DATASOURCE
     column_specs: tuple[ColumnSpec, ...] = (
         ColumnSpec(name='id', python_type=int, storage_kind='scalar', nullable=False, auto_increment=True),
         ColumnSpec(name='name', python_type=str, storage_kind='scalar', nullable=False, auto_increment=False),
     )
-    column_specs_by_name: Mapping[str, ColumnSpec] = MappingProxyType({spec.name: spec for spec in column_specs})
+    column_specs_by_name: Mapping[str, ColumnSpec] = {
+        'id': column_specs[0],
+        'name': column_specs[1],
+    }
     primary_key: tuple[str] = ('id',)
 
     indexes: tuple[tuple[str, ...], ...] = (('name',),)
@@ -468,12 +482,8 @@ class BookTable(TableProtocol):
 
     @classmethod
     def serialize_insert(cls, data: BookInsert | Book | Mapping[str, object]) -> dict[str, object]:
-        if isinstance(data, Mapping):
+        if type(data) is dict or isinstance(data, Mapping):
             result = dict(data)
-            if 'id' in data:
-                result['id'] = data['id']
-            if 'name' in data:
-                result['name'] = data['name']
             return result
         if isinstance(data, (BookInsert, Book)):
             return {
@@ -496,6 +506,8 @@ class BookTable(TableProtocol):
         instance.users = [] # type: ignore[attr-defined]
         return instance
 
+    __slots__ = ("_backend",)
+
     def __init__(self, backend: BackendProtocol) -> None:
         self._backend = backend
 
@@ -505,8 +517,12 @@ class BookTable(TableProtocol):
     def insert(self, data: BookInsert | Book | BookInsertDict) -> Book:
         return self._backend.insert(self, data)
 
-    def insert_many(self, data: Sequence[BookInsert | Book | BookInsertDict], *, batch_size: int | None = None) -> list[Book]:
-        return self._backend.insert_many(self, data, batch_size=batch_size)
+    @overload
+    def insert_many(self, data: Sequence[BookInsert | Book | BookInsertDict], *, batch_size: int | None = None, return_records: Literal[True] = True) -> list[Book]: ...
+    @overload
+    def insert_many(self, data: Sequence[BookInsert | Book | BookInsertDict], *, batch_size: int | None = None, return_records: Literal[False]) -> int: ...
+    def insert_many(self, data: Sequence[BookInsert | Book | BookInsertDict], *, batch_size: int | None = None, return_records: Literal[False, True] = True) -> list[Book] | int:
+        return self._backend.insert_many(self, data, batch_size=batch_size, return_records=return_records)
 
     def update(self, *, data: BookUpdateDict, where: BookWhereDict, include: BookIncludeDict | None = None) -> Book:
         return self._backend.update(self, data=data, where=where, include=include)
@@ -636,7 +652,7 @@ class CompositeTable(TableProtocol):
     model = Composite
     insert_model = CompositeInsert
     table_name: str = 'Composite'
-    datasource = DataSourceConfig(url='sqlite:///analytics.db', name=None)
+    datasource = _DATASOURCE
     column_specs: tuple[ColumnSpec, ...] = (
         ColumnSpec(name='id1', python_type=int, storage_kind='scalar', nullable=False, auto_increment=False),
         ColumnSpec(name='id2', python_type=int, storage_kind='scalar', nullable=False, auto_increment=False),
@@ -645,7 +661,14 @@ class CompositeTable(TableProtocol):
         ColumnSpec(name='uniq3', python_type=str, storage_kind='scalar', nullable=False, auto_increment=False),
         ColumnSpec(name='name', python_type=str, storage_kind='scalar', nullable=False, auto_increment=False),
     )
-    column_specs_by_name: Mapping[str, ColumnSpec] = MappingProxyType({spec.name: spec for spec in column_specs})
+    column_specs_by_name: Mapping[str, ColumnSpec] = {
+        'id1': column_specs[0],
+        'id2': column_specs[1],
+        'uniq1': column_specs[2],
+        'uniq2': column_specs[3],
+        'uniq3': column_specs[4],
+        'name': column_specs[5],
+    }
     primary_key: tuple[str, str] = ('id1', 'id2')
 
     indexes: tuple[tuple[str, ...], ...] = ()
@@ -660,20 +683,8 @@ class CompositeTable(TableProtocol):
 
     @classmethod
     def serialize_insert(cls, data: CompositeInsert | Composite | Mapping[str, object]) -> dict[str, object]:
-        if isinstance(data, Mapping):
+        if type(data) is dict or isinstance(data, Mapping):
             result = dict(data)
-            if 'id1' in data:
-                result['id1'] = data['id1']
-            if 'id2' in data:
-                result['id2'] = data['id2']
-            if 'uniq1' in data:
-                result['uniq1'] = data['uniq1']
-            if 'uniq2' in data:
-                result['uniq2'] = data['uniq2']
-            if 'uniq3' in data:
-                result['uniq3'] = data['uniq3']
-            if 'name' in data:
-                result['name'] = data['name']
             return result
         if isinstance(data, (CompositeInsert, Composite)):
             return {
@@ -703,6 +714,8 @@ class CompositeTable(TableProtocol):
         instance.name = row['name'] # type: ignore[attr-defined]
         return instance
 
+    __slots__ = ("_backend",)
+
     def __init__(self, backend: BackendProtocol) -> None:
         self._backend = backend
 
@@ -712,8 +725,12 @@ class CompositeTable(TableProtocol):
     def insert(self, data: CompositeInsert | Composite | CompositeInsertDict) -> Composite:
         return self._backend.insert(self, data)
 
-    def insert_many(self, data: Sequence[CompositeInsert | Composite | CompositeInsertDict], *, batch_size: int | None = None) -> list[Composite]:
-        return self._backend.insert_many(self, data, batch_size=batch_size)
+    @overload
+    def insert_many(self, data: Sequence[CompositeInsert | Composite | CompositeInsertDict], *, batch_size: int | None = None, return_records: Literal[True] = True) -> list[Composite]: ...
+    @overload
+    def insert_many(self, data: Sequence[CompositeInsert | Composite | CompositeInsertDict], *, batch_size: int | None = None, return_records: Literal[False]) -> int: ...
+    def insert_many(self, data: Sequence[CompositeInsert | Composite | CompositeInsertDict], *, batch_size: int | None = None, return_records: Literal[False, True] = True) -> list[Composite] | int:
+        return self._backend.insert_many(self, data, batch_size=batch_size, return_records=return_records)
 
     def update(self, *, data: CompositeUpdateDict, where: CompositeWhereDict, include: CompositeIncludeDict | None = None) -> Composite:
         return self._backend.update(self, data=data, where=where, include=include)
@@ -869,7 +886,7 @@ class UserTable(TableProtocol):
     model = User
     insert_model = UserInsert
     table_name: str = 'User'
-    datasource = DataSourceConfig(url='sqlite:///analytics.db', name=None)
+    datasource = _DATASOURCE
     column_specs: tuple[ColumnSpec, ...] = (
         ColumnSpec(name='id', python_type=int, storage_kind='scalar', nullable=False, auto_increment=True),
         ColumnSpec(name='name', python_type=str, storage_kind='scalar', nullable=False, auto_increment=False),
@@ -879,7 +896,15 @@ class UserTable(TableProtocol):
         ColumnSpec(name='type', python_type=UserType, storage_kind='scalar', nullable=False, auto_increment=False),
         ColumnSpec(name='vip_level', python_type=UserVIPLevel | None, storage_kind='scalar', nullable=True, auto_increment=False),
     )
-    column_specs_by_name: Mapping[str, ColumnSpec] = MappingProxyType({spec.name: spec for spec in column_specs})
+    column_specs_by_name: Mapping[str, ColumnSpec] = {
+        'id': column_specs[0],
+        'name': column_specs[1],
+        'email': column_specs[2],
+        'last_login': column_specs[3],
+        'status': column_specs[4],
+        'type': column_specs[5],
+        'vip_level': column_specs[6],
+    }
     primary_key: tuple[str] = ('id',)
 
     indexes: tuple[tuple[str, ...], ...] = (('name',), ('name', 'email'), ('last_login',),)
@@ -897,16 +922,8 @@ class UserTable(TableProtocol):
 
     @classmethod
     def serialize_insert(cls, data: UserInsert | User | Mapping[str, object]) -> dict[str, object]:
-        if isinstance(data, Mapping):
+        if type(data) is dict or isinstance(data, Mapping):
             result = dict(data)
-            if 'id' in data:
-                result['id'] = data['id']
-            if 'name' in data:
-                result['name'] = data['name']
-            if 'email' in data:
-                result['email'] = data['email']
-            if 'last_login' in data:
-                result['last_login'] = data['last_login']
             if 'status' in data:
                 result['status'] = data['status'].value  # type: ignore[attr-defined]
             if 'type' in data:
@@ -947,6 +964,8 @@ class UserTable(TableProtocol):
         instance.books = [] # type: ignore[attr-defined]
         return instance
 
+    __slots__ = ("_backend",)
+
     def __init__(self, backend: BackendProtocol) -> None:
         self._backend = backend
 
@@ -956,8 +975,12 @@ class UserTable(TableProtocol):
     def insert(self, data: UserInsert | User | UserInsertDict) -> User:
         return self._backend.insert(self, data)
 
-    def insert_many(self, data: Sequence[UserInsert | User | UserInsertDict], *, batch_size: int | None = None) -> list[User]:
-        return self._backend.insert_many(self, data, batch_size=batch_size)
+    @overload
+    def insert_many(self, data: Sequence[UserInsert | User | UserInsertDict], *, batch_size: int | None = None, return_records: Literal[True] = True) -> list[User]: ...
+    @overload
+    def insert_many(self, data: Sequence[UserInsert | User | UserInsertDict], *, batch_size: int | None = None, return_records: Literal[False]) -> int: ...
+    def insert_many(self, data: Sequence[UserInsert | User | UserInsertDict], *, batch_size: int | None = None, return_records: Literal[False, True] = True) -> list[User] | int:
+        return self._backend.insert_many(self, data, batch_size=batch_size, return_records=return_records)
 
     def update(self, *, data: UserUpdateDict, where: UserWhereDict, include: UserIncludeDict | None = None) -> User:
         return self._backend.update(self, data=data, where=where, include=include)
@@ -1075,13 +1098,17 @@ class UserBookTable(TableProtocol):
     model = UserBook
     insert_model = UserBookInsert
     table_name: str = 'UserBook'
-    datasource = DataSourceConfig(url='sqlite:///analytics.db', name=None)
+    datasource = _DATASOURCE
     column_specs: tuple[ColumnSpec, ...] = (
         ColumnSpec(name='user_id', python_type=int, storage_kind='scalar', nullable=False, auto_increment=False),
         ColumnSpec(name='book_id', python_type=int, storage_kind='scalar', nullable=False, auto_increment=False),
         ColumnSpec(name='created_at', python_type=datetime, storage_kind='scalar', nullable=False, auto_increment=False),
     )
-    column_specs_by_name: Mapping[str, ColumnSpec] = MappingProxyType({spec.name: spec for spec in column_specs})
+    column_specs_by_name: Mapping[str, ColumnSpec] = {
+        'user_id': column_specs[0],
+        'book_id': column_specs[1],
+        'created_at': column_specs[2],
+    }
     primary_key: tuple[str, str] = ('user_id', 'book_id')
 
     indexes: tuple[tuple[str, ...], ...] = (('created_at',),)
@@ -1099,14 +1126,8 @@ class UserBookTable(TableProtocol):
 
     @classmethod
     def serialize_insert(cls, data: UserBookInsert | UserBook | Mapping[str, object]) -> dict[str, object]:
-        if isinstance(data, Mapping):
+        if type(data) is dict or isinstance(data, Mapping):
             result = dict(data)
-            if 'user_id' in data:
-                result['user_id'] = data['user_id']
-            if 'book_id' in data:
-                result['book_id'] = data['book_id']
-            if 'created_at' in data:
-                result['created_at'] = data['created_at']
             return result
         if isinstance(data, (UserBookInsert, UserBook)):
             return {
@@ -1132,6 +1153,8 @@ class UserBookTable(TableProtocol):
         instance.created_at = row['created_at'] # type: ignore[attr-defined]
         return instance
 
+    __slots__ = ("_backend",)
+
     def __init__(self, backend: BackendProtocol) -> None:
         self._backend = backend
 
@@ -1141,8 +1164,12 @@ class UserBookTable(TableProtocol):
     def insert(self, data: UserBookInsert | UserBook | UserBookInsertDict) -> UserBook:
         return self._backend.insert(self, data)
 
-    def insert_many(self, data: Sequence[UserBookInsert | UserBook | UserBookInsertDict], *, batch_size: int | None = None) -> list[UserBook]:
-        return self._backend.insert_many(self, data, batch_size=batch_size)
+    @overload
+    def insert_many(self, data: Sequence[UserBookInsert | UserBook | UserBookInsertDict], *, batch_size: int | None = None, return_records: Literal[True] = True) -> list[UserBook]: ...
+    @overload
+    def insert_many(self, data: Sequence[UserBookInsert | UserBook | UserBookInsertDict], *, batch_size: int | None = None, return_records: Literal[False]) -> int: ...
+    def insert_many(self, data: Sequence[UserBookInsert | UserBook | UserBookInsertDict], *, batch_size: int | None = None, return_records: Literal[False, True] = True) -> list[UserBook] | int:
+        return self._backend.insert_many(self, data, batch_size=batch_size, return_records=return_records)
 
     def update(self, *, data: UserBookUpdateDict, where: UserBookWhereDict, include: UserBookIncludeDict | None = None) -> UserBook:
         return self._backend.update(self, data=data, where=where, include=include)
@@ -1188,19 +1215,17 @@ class UserBookTable(TableProtocol):
     def delete_many(self, *, where: UserBookWhereDict | None = None, return_records: Literal[False, True] = False) -> int | list[UserBook]:
         return self._backend.delete_many(self, where=where, return_records=return_records)
 class GeneratedClient(ClientBase):
-    datasource: DataSourceConfig = DataSourceConfig(
-        url='sqlite:///analytics.db',
-        name=None,
-    )
+    datasource: DataSourceConfig = _DATASOURCE
 
     def __init__(self, *, datasource: DataSourceConfig = datasource, echo_sql: bool = False) -> None:
         super().__init__(datasource=datasource, echo_sql=echo_sql)
-        self.address = AddressTable(self._backend())
-        self.birth_day = BirthDayTable(self._backend())
-        self.book = BookTable(self._backend())
-        self.composite = CompositeTable(self._backend())
-        self.user = UserTable(self._backend())
-        self.user_book = UserBookTable(self._backend())
+        backend = self._backend()
+        self.address = AddressTable(backend)
+        self.birth_day = BirthDayTable(backend)
+        self.book = BookTable(backend)
+        self.composite = CompositeTable(backend)
+        self.user = UserTable(backend)
+        self.user_book = UserBookTable(backend)
         self._tables = (
             self.address,
             self.birth_day,
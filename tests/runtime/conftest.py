@@ -8,7 +8,8 @@ from typing import Any, cast
 
 import pytest
 
-from dclassql.codegen import generate_client
+from dclassql.codegen import GeneratedModule, generate_client
+from dclassql.db_pool import BaseDBPool
 from dclassql.model_inspector import DataSourceConfig
 
 __datasource__ = {"url": "sqlite:///:memory:"}
@@ -44,24 +45,37 @@ class RuntimeEnumUser:
     s2: IntEnumTest
 
 
+_GENERATED: dict[type[Any], GeneratedModule] = {}
+'''当前 __datasource__ 下各模型的生成结果, prepare_database 切换数据源时清空'''
+
+
+def _generate(model: type[Any]) -> GeneratedModule:
+    # generate_client 会读取模型所在模块 (即本模块) 的 __datasource__ 并把 url 写进生成代码,
+    # 缓存只对当前数据源有效; 同一测试里 prepare_database 与 build_client 共用一次生成
+    module = _GENERATED.get(model)
+    if module is None:
+        module = _GENERATED[model] = generate_client([model])
+    return module
+
+
 def prepare_database(db_path: Path) -> None:
     global __datasource__
     if db_path.exists():
         db_path.unlink()
     __datasource__ = {"provider": "sqlite", "url": f"sqlite:///{db_path.as_posix()}"}
-    module = generate_client([RuntimeUser])
+    _GENERATED.clear()
+    module = _generate(RuntimeUser)
     namespace: dict[str, Any] = {}
     exec(module.code, namespace)
     client = namespace[module.client_class_name](datasource=DataSourceConfig(url=__datasource__["url"]))
-    try:
-        client.push_db()
-        client.runtime_user.delete_many()
-    finally:
-        client.close()
+    # 不关闭连接: 连接按 datasource.identity 缓存在线程本地, 随后 build_client 得到的客户端直接复用,
+    # 省去一次重新打开与 PRAGMA 设置; 由 cleanup_clients 在测试结束时统一关闭
+    client.push_db()
+    client.runtime_user.delete_many()
 
 
 def build_client() -> tuple[dict[str, Any], Any]:
-    module = generate_client([RuntimeUser])
+    module = _generate(RuntimeUser)
     namespace: dict[str, Any] = {}
     exec(module.code, namespace)
     namespace["__client_class_name__"] = module.client_class_name
@@ -71,7 +85,7 @@ def build_client() -> tuple[dict[str, Any], Any]:
 
 
 def build_enum_client() -> tuple[dict[str, Any], Any]:
-    module = generate_client([RuntimeEnumUser])
+    module = _generate(RuntimeEnumUser)
     namespace: dict[str, Any] = {}
     exec(module.code, namespace)
     namespace["__client_class_name__"] = module.client_class_name
@@ -82,3 +96,5 @@ def build_enum_client() -> tuple[dict[str, Any], Any]:
 @pytest.fixture(autouse=True)
 def cleanup_clients():
     yield
+    BaseDBPool.close_all()
+    _GENERATED.clear()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import sqlite3
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+import pytest
+
 from dclassql import record_sql
 
 from .conftest import RuntimeUser, build_client, prepare_database
@@ -50,6 +53,15 @@ def test_insert_and_find_roundtrip(tmp_path: Path):
     client.__class__.close_all()
 
 
+def test_generated_tables_use_slots(tmp_path: Path):
+    prepare_database(tmp_path / "runtime.db")
+    _, client = build_client()
+    assert not hasattr(client.runtime_user, "__dict__")
+    with pytest.raises(AttributeError):
+        client.runtime_user.extra = 1
+    client.__class__.close_all()
+
+
 def test_find_returns_distinct_instances(tmp_path: Path):
     db_path = tmp_path / "runtime.db"
     prepare_database(db_path)
@@ -145,6 +157,140 @@ def test_insert_many_utilises_backend(tmp_path: Path):
     client.__class__.close_all()
 
 
+def test_insert_sql_is_rendered_once_per_shape(tmp_path: Path):
+    db_path = tmp_path / "runtime.db"
+    prepare_database(db_path)
+    namespace, client = build_client()
+    user_table = client.runtime_user
+
+    user_table.insert({"id": None, "name": "Alice", "email": None})
+    user_table.insert({"id": None, "name": "Bob", "email": None})
+    user_table.insert_many([{"id": None, "name": f"U{i}", "email": None} for i in range(5)], batch_size=2)
+
+    backend = user_table._backend
+    assert sorted((columns, count) for _, columns, count in backend._insert_sql_cache) == [
+        (("id", "name", "email"), 1),
+        (("id", "name", "email"), 2),
+    ]
+    assert len(user_table.find_many()) == 7
+    client.__class__.close_all()
+
+
+def test_insert_sql_cache_does_not_grow_with_batch_length(tmp_path: Path):
+    db_path = tmp_path / "runtime.db"
+    prepare_database(db_path)
+    _, client = build_client()
+    user_table = client.runtime_user
+    backend = user_table._backend
+
+    for size in range(1, 41):
+        user_table.insert_many([{"id": None, "name": f"U{size}-{i}", "email": None} for i in range(size)])
+    user_table.insert_many([{"id": None, "name": f"B{i}", "email": None} for i in range(9)], batch_size=4)
+
+    # 只缓存整批 (batch_size=4) 的形态, 长度各异的尾批每次现拼
+    assert sorted((columns, count) for _, columns, count in backend._insert_sql_cache) == [
+        (("id", "name", "email"), 4),
+    ]
+    assert len(user_table.find_many()) == sum(range(1, 41)) + 9
+    client.__class__.close_all()
+
+
+def test_insert_many_splits_batches_at_variable_limit(tmp_path: Path):
+    db_path = tmp_path / "runtime.db"
+    prepare_database(db_path)
+    _, client = build_client()
+    user_table = client.runtime_user
+    backend = user_table._backend
+    backend.max_variable_number = 7
+
+    with record_sql() as sqls:
+        inserted = user_table.insert_many([{"id": None, "name": f"U{i}", "email": None} for i in range(5)])
+    assert [len(params) for _, params in sqls] == [6, 6, 3]
+    assert [user.name for user in inserted] == ["U0", "U1", "U2", "U3", "U4"]
+    client.__class__.close_all()
+
+
+def test_insert_many_without_records_uses_single_row_statement(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    db_path = tmp_path / "runtime.db"
+    prepare_database(db_path)
+    _, client = build_client()
+    user_table = client.runtime_user
+
+    with record_sql() as sqls:
+        inserted = user_table.insert_many(
+            [{"id": None, "name": f"U{i}", "email": None} for i in range(3)],
+            return_records=False,
+        )
+    assert inserted == 3
+    assert sqls == [
+        ('INSERT INTO "RuntimeUser" ("id","name","email") VALUES (?,?,?);', (None, f"U{i}", None))
+        for i in range(3)
+    ]
+    assert [user.name for user in user_table.find_many(order_by={"id": "asc"})] == ["U0", "U1", "U2"]
+    assert user_table.insert_many([], return_records=False) == 0
+
+    # 没有 record_sql / echo 时不逐行展开参数记录
+    backend = user_table._backend
+    logged: list[str] = []
+    monkeypatch.setattr(backend, "_log_sql", lambda sql, params: logged.append(sql))
+    assert user_table.insert_many([{"id": None, "name": f"V{i}", "email": None} for i in range(3)], return_records=False) == 3
+    assert logged == []
+    client.__class__.close_all()
+
+
+def test_insert_many_respects_connection_variable_limit(tmp_path: Path):
+    db_path = tmp_path / "runtime.db"
+    prepare_database(db_path)
+    _, client = build_client()
+    user_table = client.runtime_user
+    backend = user_table._backend
+    backend._acquire_connection().setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 7)
+
+    with record_sql() as sqls:
+        user_table.insert_many([{"id": None, "name": f"U{i}", "email": None} for i in range(5)])
+    assert [len(params) for _, params in sqls] == [6, 6, 3]
+    client.__class__.close_all()
+
+
+def test_auto_commit_is_deferred_inside_open_transaction(tmp_path: Path):
+    db_path = tmp_path / "runtime.db"
+    prepare_database(db_path)
+    _, client = build_client()
+    user_table = client.runtime_user
+    backend = user_table._backend
+
+    backend._begin_transaction()
+    user_table.insert({"id": None, "name": "Pending", "email": None})
+    backend._rollback_transaction()
+    assert user_table.find_many() == []
+
+    backend._begin_transaction()
+    user_table.insert({"id": None, "name": "Kept", "email": None})
+    backend._commit_transaction()
+    assert [user.name for user in user_table.find_many()] == ["Kept"]
+    client.__class__.close_all()
+
+
+def test_insert_many_rolls_back_all_batches_on_failure(tmp_path: Path):
+    db_path = tmp_path / "runtime.db"
+    prepare_database(db_path)
+    _, client = build_client()
+    user_table = client.runtime_user
+
+    with pytest.raises(sqlite3.IntegrityError):
+        user_table.insert_many(
+            [
+                {"id": 1, "name": "First", "email": None},
+                {"id": 2, "name": "Second", "email": None},
+                {"id": 1, "name": "Duplicate", "email": None},
+            ],
+            batch_size=1,
+        )
+
+    assert user_table.find_many() == []
+    client.__class__.close_all()
+
+
 def test_insert_many_generates_sequential_ids(tmp_path: Path):
     db_path = tmp_path / "runtime.db"
     prepare_database(db_path)
@@ -267,3 +413,80 @@ def test_find_many_supports_distinct(tmp_path: Path) -> None:
     assert [user.name for user in multi_column] == ["n1", "n2", "n3"]
 
     client.__class__.close_all()
+
+
+def test_backend_applies_pragmas_once_per_connection(tmp_path: Path):
+    from dclassql.runtime.backends import SQLiteBackend
+
+    pragmas = {"journal_mode": "WAL", "synchronous": "NORMAL"}
+    conn = sqlite3.connect(tmp_path / "direct.db")
+    SQLiteBackend(conn, pragmas=pragmas)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    conn.close()
+
+    opened: list[sqlite3.Connection] = []
+
+    def factory() -> sqlite3.Connection:
+        opened.append(sqlite3.connect(tmp_path / "factory.db", check_same_thread=False))
+        return opened[-1]
+
+    backend = SQLiteBackend(factory, pragmas=pragmas)
+    rows = backend.query_raw("PRAGMA synchronous")
+    assert list(rows[0].values()) == [1]
+    backend.query_raw("SELECT 1")
+    assert len(opened) == 1
+    assert opened[0].execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    backend.close()
+
+
+def test_plain_select_sql_matches_pypika_rendering(tmp_path: Path):
+    db_path = tmp_path / "runtime.db"
+    prepare_database(db_path)
+    _, client = build_client()
+    user_table = client.runtime_user
+    backend = user_table._backend
+
+    cases: list[dict[str, Any]] = [
+        {"where": None, "order_by": None, "take": None, "skip": None},
+        {"where": {"name": "Alice", "email": None}, "order_by": None, "take": 1, "skip": 0},
+        {"where": {"id": 3}, "order_by": {"name": "desc", "id": "asc"}, "take": 5, "skip": 2},
+        {"where": {"id": {"GTE": 2}, "name": {"IN": ["A", "B"]}}, "order_by": None, "take": None, "skip": None},
+        {"where": {"email": {"NOT_IN": ("x",)}, "id": {"EQ": None}}, "order_by": {"id": "asc"}, "take": 3, "skip": None},
+    ]
+    for case in cases:
+        plain = backend._build_select_sql(user_table, case["where"], case["order_by"], case["take"], case["skip"])
+        sql_table = backend.table_cls(user_table.model.__name__)
+        if case["order_by"]:
+            sql_table = sql_table.as_("t")
+        query, params = backend._build_select_query(user_table, sql_table, case["where"], case["order_by"])
+        if case["skip"] is not None:
+            query = query.offset(case["skip"])
+        if case["take"] is not None:
+            query = query.limit(case["take"])
+        assert plain == (backend._render_query(query), params)
+    assert len(backend._select_sql_cache) == len(cases)
+    assert backend._build_select_sql(user_table, {"name": "Bob", "email": None}, None, 10, 20) == (
+        'SELECT "id","name","email" FROM "RuntimeUser" WHERE "name"=? AND "email" IS NULL LIMIT 10 OFFSET 20;',
+        ["Bob"],
+    )
+    assert len(backend._select_sql_cache) == len(cases)
+
+    assert backend._build_select_sql(user_table, {"name": {"CONTAINS": "A"}}, None, None, None) is None
+    assert backend._build_select_sql(user_table, {"id": {"IN": []}}, None, None, None) is None
+    assert backend._build_select_sql(user_table, {"id": {"GT": 1, "LT": 5}}, None, None, None) is None
+    client.__class__.close_all()
+
+
+def test_query_raw_returns_plain_dicts(tmp_path: Path):
+    db_path = tmp_path / "runtime.db"
+    prepare_database(db_path)
+    _, client = build_client()
+    backend = client.runtime_user._backend
+    client.runtime_user.insert({"id": None, "name": "Alice", "email": None})
+
+    rows = backend.query_raw('SELECT "name", "email" AS "mail" FROM "RuntimeUser"')
+    assert rows == [{"name": "Alice", "mail": None}]
+    assert type(rows[0]) is dict
+    assert backend.query_raw('CREATE TABLE IF NOT EXISTS "Scratch" ("id" INTEGER)') == []
+    client.__class__.close_all()
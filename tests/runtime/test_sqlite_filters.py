@@ -79,6 +79,64 @@ def test_where_filters_support_scalar_operations(tmp_path: Path):
     client.__class__.close_all()
 
 
+def test_large_in_lists_bind_single_json_parameter(tmp_path: Path):
+    db_path = tmp_path / "json_in.db"
+    prepare_database(db_path)
+    namespace, client = build_client()
+    user_table = client.runtime_user
+    InsertModel = namespace["RuntimeUserInsert"]
+
+    user_table.insert_many([InsertModel(id=None, name=f"U{i}", email=None) for i in range(1, 13)])
+    ids = list(range(1, 11))
+
+    with record_sql() as sqls:
+        in_results = user_table.find_many(where={"id": {"IN": ids}}, order_by={"id": "asc"})
+    assert sqls == [
+        (
+            'SELECT "t"."id","t"."name","t"."email" FROM "RuntimeUser" "t" WHERE "t"."id" IN (SELECT value FROM json_each(?)) ORDER BY "t"."id" ASC;',
+            ("[1, 2, 3, 4, 5, 6, 7, 8, 9, 10]",),
+        )
+    ]
+    assert [row.id for row in in_results] == ids
+
+    with record_sql() as sqls:
+        not_in_results = user_table.find_many(
+            where={"OR": [{"id": {"NOT_IN": ids}}, {"name": {"IN": [f"U{i}" for i in range(3, 12)]}}]},
+            order_by={"id": "asc"},
+        )
+    assert sqls == [
+        (
+            'SELECT "t"."id","t"."name","t"."email" FROM "RuntimeUser" "t" WHERE "t"."id" NOT IN (SELECT value FROM json_each(?)) OR "t"."name" IN (SELECT value FROM json_each(?)) ORDER BY "t"."id" ASC;',
+            ("[1, 2, 3, 4, 5, 6, 7, 8, 9, 10]", '["U3", "U4", "U5", "U6", "U7", "U8", "U9", "U10", "U11"]'),
+        )
+    ]
+    assert [row.id for row in not_in_results] == list(range(3, 13))
+
+    # 含非 str / int 的列表依赖 sqlite3 适配, 仍逐项展开
+    with record_sql() as sqls:
+        mixed_results = user_table.find_many(where={"id": {"IN": [*ids, 11.0]}})
+    assert sqls[0][0].endswith(f'WHERE "id" IN ({",".join(["?"] * 11)});')
+    assert len(mixed_results) == 11
+
+    # 值类型与列类型不一致时依赖列亲和性转换, 长列表也逐项展开, 结果与短列表一致
+    numeric_name = user_table.insert(InsertModel(id=None, name="5", email=None))
+    short_results = user_table.find_many(where={"name": {"IN": [5, 6]}})
+    with record_sql() as sqls:
+        long_results = user_table.find_many(where={"name": {"IN": list(range(1, 20))}})
+    assert sqls[0][0].endswith(f'WHERE "name" IN ({",".join(["?"] * 19)});')
+    assert [row.id for row in short_results] == [row.id for row in long_results] == [numeric_name.id]
+
+    with record_sql() as sqls:
+        str_id_results = user_table.find_many(
+            where={"OR": [{"id": {"IN": [str(i) for i in ids]}}, {"name": "nobody"}]},
+            order_by={"id": "asc"},
+        )
+    assert "json_each" not in sqls[0][0]
+    assert [row.id for row in str_id_results] == ids
+
+    client.__class__.close_all()
+
+
 def test_like_escapes_special_chars(tmp_path: Path):
     db_path = tmp_path / "escapes.db"
     prepare_database(db_path)
@@ -222,3 +222,32 @@ def test_upsert_updates_on_conflict(tmp_path: Path) -> None:
     assert sqls == [('SELECT "id","name","email" FROM "RuntimeUser" WHERE "id"=? LIMIT 1;', (1,))]
     assert fetched.name == "Upserted"
     client.__class__.close_all()
+
+
+def test_plain_mutation_sql_is_cached_per_shape(tmp_path: Path) -> None:
+    db_path = tmp_path / "mutation_cache.db"
+    prepare_database(db_path)
+    namespace, client = build_client()
+    user_table = client.runtime_user
+    backend = user_table._backend
+
+    _insert_three(namespace, user_table)
+
+    with record_sql() as sqls:
+        user_table.update(data={"name": "Foo2"}, where={"id": 1})
+        user_table.update(data={"name": "Bar2"}, where={"id": 2})
+        user_table.delete_many(where={"name": {"IN": ["Foo2", "Bar2"]}})
+        user_table.delete_many(where={"name": {"IN": ["Baz", "Qux"]}})
+    assert sqls == [
+        ('UPDATE "RuntimeUser" SET "name"=? WHERE "id"=? RETURNING "id", "name", "email";', ("Foo2", 1)),
+        ('UPDATE "RuntimeUser" SET "name"=? WHERE "id"=? RETURNING "id", "name", "email";', ("Bar2", 2)),
+        ('DELETE FROM "RuntimeUser" WHERE "name" IN (?,?);', ("Foo2", "Bar2")),
+        ('DELETE FROM "RuntimeUser" WHERE "name" IN (?,?);', ("Baz", "Qux")),
+    ]
+    assert len(backend._mutation_sql_cache) == 2
+    assert user_table.find_many() == []
+
+    # 含 LIKE 等复杂条件时仍交给 PyPika, 不进入缓存
+    user_table.update_many(data={"name": "X"}, where={"name": {"CONTAINS": "a"}})
+    assert len(backend._mutation_sql_cache) == 2
+    client.__class__.close_all()
@@ -164,12 +164,11 @@ def test_lazy_relations(tmp_path):
 
         with record_sql() as sqls:
             user_included = client.lazy_user.find_many(include={"addresses": True, "birthday": True})
+        # 多行结果的 include 按关系批量预取, 每个关系一条 IN 查询
         assert sqls == [
             ('SELECT "id","name" FROM "LazyUser";', ()),
-            ('SELECT "user_id","date" FROM "LazyBirthDay" WHERE "user_id"=? LIMIT 1;', (1,)),
-            ('SELECT "id","user_id","location" FROM "LazyAddress" WHERE "user_id"=?;', (1,)),
-            ('SELECT "user_id","date" FROM "LazyBirthDay" WHERE "user_id"=? LIMIT 1;', (2,)),
-            ('SELECT "id","user_id","location" FROM "LazyAddress" WHERE "user_id"=?;', (2,)),
+            ('SELECT "user_id","date" FROM "LazyBirthDay" WHERE "user_id" IN (?,?);', (1, 2)),
+            ('SELECT "id","user_id","location" FROM "LazyAddress" WHERE "user_id" IN (?,?);', (1, 2)),
         ]
         first_user = user_included[0]
         assert type(first_user.addresses) is list
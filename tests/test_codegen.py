@@ -600,8 +600,9 @@ def test_generate_client_matches_expected_shape() -> None:
     assert get_origin(insert_many_data) is ABCSequence
     inner_union = get_args(insert_many_data)[0]
     assert set(get_args(inner_union)) == {user_insert_cls, user_insert_dict, namespace['User']}
-    assert insert_many_hints['return'] == list[namespace['User']]
+    assert insert_many_hints['return'] == list[namespace['User']] | int
     assert insert_many_hints['batch_size'] == int | None
+    assert set(get_args(insert_many_hints['return_records'])) == {False, True}
 
     table_init_hints = get_type_hints(user_table_cls.__init__, globalns=namespace, localns=namespace)
     assert table_init_hints['backend'] == backend_protocol
@@ -49,6 +49,9 @@ def test_model_context_shapes_insert_and_typeddict_sections() -> None:
     assert relation_filter_names == ["AddressUserRelationFilter"]
     column_names = [col.name for col in address_ctx.model_info.columns]
     assert column_names == ["id", "location", "user_id"]
+    assert address_info.include_literals == ("user",)
+    assert address_info.sortable_literals == ("id", "location", "user_id")
+    assert compiler.graph.by_name["User"].include_literals == ("addresses", "birthday", "books")
 
 
 def test_client_context_binds_models_to_datasource_backends() -> None:
@@ -68,7 +71,7 @@ def test_collect_exports_includes_expected_symbols() -> None:
     compiler = _compiler([User, Address, BirthDay, Book, UserBook])
     contexts = [
         compiler.build_model_context(compiler.graph.by_name[name])
-        for name in sorted(compiler.graph.by_name)
+        for name in compiler.model_names
     ]
 
     exports = compiler.collect_exports(contexts)
@@ -1,3 +1,5 @@
+import sqlite3
+
 from dclassql.db_pool import BaseDBPool, save_local
 
 
@@ -17,6 +19,23 @@ class CounterPool(BaseDBPool):
         return self.label, self.calls
 
 
+class OtherPool(BaseDBPool):
+    @save_local
+    def default_value(self) -> str:
+        return "other"
+
+
+class SQLitePool(BaseDBPool):
+    def __init__(self, statements: list[str]) -> None:
+        self.statements = statements
+
+    @save_local
+    def connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(":memory:")
+        conn.set_trace_callback(self.statements.append)
+        return conn
+
+
 def test_save_local_supports_bare_decorator() -> None:
     pool = CounterPool("a")
 
@@ -36,3 +55,24 @@ def test_save_local_supports_keyed_decorator() -> None:
     assert second.keyed_value() == ("second", 1)
 
     CounterPool.close_all()
+
+
+def test_save_local_default_key_is_per_class() -> None:
+    assert CounterPool("a").default_value() == ("a", 1)
+    assert OtherPool().default_value() == "other"
+
+    CounterPool.close_all()
+
+
+def test_close_all_optimizes_only_written_sqlite_connections() -> None:
+    read_statements: list[str] = []
+    SQLitePool(read_statements).connection().execute("SELECT 1").fetchall()
+    SQLitePool.close_all()
+    assert "PRAGMA optimize;" not in read_statements
+
+    write_statements: list[str] = []
+    conn = SQLitePool(write_statements).connection()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.execute("INSERT INTO t VALUES (1)")
+    SQLitePool.close_all()
+    assert write_statements[-1] == "PRAGMA optimize;"
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 import pytest
-from dclassql.model_inspector.table_constraints import Col, ColGroup, TableConstraints
+from dclassql.model_inspector.table_constraints import Col, ColGroup, FakeSelf, TableConstraints
 from dclassql.unwarp import unwarp
 
 __datasource__ = {
@@ -66,6 +66,7 @@ def test_table_constraints():
     assert info.primary_key.cols == (Col('user_id'), Col('book_id'))
     assert user_book.primary_key() == (user.id, book.id)
     assert next(user_book.index()) == user_book.created_at
+    assert TableConstraints.from_dc(UserBook) is info
 
 
 @dataclass
@@ -97,3 +98,74 @@ class GeneratorPK:
 def test_primary_key_generator_tuple_error():
     with pytest.raises(TypeError, match=r'May be you meant to use "return" instead?'):
         TableConstraints.from_dc(GeneratorPK)
+
+
+@dataclass
+class NestedIndexes:
+    id: int
+    name: str
+    email: str
+
+    def index(self):
+        return [self.name, [(self.name, self.email), [self.email]]]
+
+
+@dataclass
+class StringIndex:
+    id: int
+    email: str
+
+    def unique_index(self):
+        return 'email'
+
+
+def test_nested_index_specs_keep_declaration_order():
+    info = TableConstraints.from_dc(NestedIndexes)
+    assert [group.names for group in info.indexes] == [('name',), ('name', 'email'), ('email',)]
+    with pytest.raises(TypeError, match='Unsupported index specification'):
+        TableConstraints.from_dc(StringIndex)
+
+
+@dataclass
+class UnderscoreColumn:
+    id: int
+    _cols: str
+
+    def index(self):
+        return [self._cols]
+
+
+def test_fake_self_resolves_any_field_name():
+    fake = FakeSelf()
+    assert fake.name == Col('name')
+    assert fake._cols == Col('_cols')
+    info = TableConstraints.from_dc(UnderscoreColumn)
+    assert [group.names for group in info.indexes] == [('_cols',)]
+
+
+@dataclass(slots=True, frozen=True)
+class TaggedCol(Col):
+    pass
+
+
+def test_col_group_accepts_col_subclasses_and_rejects_others():
+    assert ColGroup((TaggedCol('a'), Col('b'))).names == ('a', 'b')
+    with pytest.raises(TypeError, match='ColGroup cols must be Col instances'):
+        ColGroup(('a',))  # type: ignore[arg-type]
+
+
+@dataclass
+class NestedSubclassIndexes:
+    id: int
+    name: str
+    email: str
+
+    def index(self):
+        return [TaggedCol('name'), [(self.name, TaggedCol('email'))], iter([TaggedCol('email')])]
+
+
+def test_nested_index_specs_accept_col_subclasses():
+    info = TableConstraints.from_dc(NestedSubclassIndexes)
+    assert [group.names for group in info.indexes] == [('name',), ('name', 'email'), ('email',)]
+    with pytest.raises(TypeError, match='Unsupported index specification'):
+        list(TableConstraints._iter_index_groups([TaggedCol('name'), 42]))
@@ -14,7 +14,7 @@ __datasource__ = {
 
 from dclassql.codegen import generate_client
 from dclassql.push import db_push
-from dclassql.push.sqlite import _build_sqlite_schema, push_sqlite
+from dclassql.push.sqlite import SQLITE_PUSHER, _build_sqlite_schema, push_sqlite
 from dclassql.runtime.backends.protocols import SchemaTableProtocol
 
 
@@ -48,6 +48,19 @@ class Event:
     created_at: datetime
 
 
+@dataclass
+class Membership:
+    tenant_id: int
+    user_id: int
+    role: str
+
+    def primary_key(self):
+        return self.tenant_id, self.user_id
+
+    def index(self):
+        yield self.role, self.user_id
+
+
 def generated_tables(*models: type[Any]) -> list[SchemaTableProtocol]:
     generated = generate_client(list(models))
     namespace: dict[str, Any] = {}
@@ -113,6 +126,28 @@ def test_db_push_creates_table_and_indexes():
     )
 
 
+def test_db_push_renders_composite_primary_key_and_index():
+    table = generated_tables(Membership)[0]
+    create_sql, index_entries = _build_sqlite_schema(table)
+
+    assert create_sql == (
+        'CREATE TABLE IF NOT EXISTS "Membership" '
+        '("tenant_id" INTEGER,"user_id" INTEGER,"role" TEXT NOT NULL,'
+        'PRIMARY KEY ("tenant_id","user_id"));'
+    )
+    assert index_entries == [
+        (
+            'idx_Membership_role_user_id',
+            'CREATE INDEX IF NOT EXISTS "idx_Membership_role_user_id" ON "Membership" ("role", "user_id");',
+        ),
+    ]
+
+    conn = sqlite3.connect(":memory:")
+    push_sqlite(conn, [table])
+    pk_columns = [row[1] for row in conn.execute('PRAGMA table_info("Membership")') if row[5]]
+    assert pk_columns == ["tenant_id", "user_id"]
+
+
 def test_db_push_infers_type_alias_value():
     table = generated_tables(AliasUser)[0]
     create_sql, _ = _build_sqlite_schema(table)
@@ -141,6 +176,32 @@ def test_db_push_adds_implicit_id_primary_key_for_model_without_id():
     assert rows == [(1, "start", "2026-01-01T00:00:00")]
 
 
+def test_db_push_fast_push_restores_connection_pragmas(tmp_path, monkeypatch):
+    table = generated_tables(User)[0]
+    conn = sqlite3.connect(tmp_path / "fast.db")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    seen: list[tuple[int, str]] = []
+    original_execute_statements = SQLITE_PUSHER.execute_statements
+
+    def spy(conn_: sqlite3.Connection, statements: Any) -> None:
+        seen.append((
+            conn_.execute("PRAGMA synchronous").fetchone()[0],
+            conn_.execute("PRAGMA journal_mode").fetchone()[0],
+        ))
+        original_execute_statements(conn_, statements)
+
+    monkeypatch.setattr(SQLITE_PUSHER, "execute_statements", spy)
+    db_push([table], conn, provider="sqlite", fast_push=True)
+
+    assert seen == [(0, "memory")]
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='User'"
+    ).fetchone()[0] == 1
+
+
 def test_db_push_sync_indexes_aligns_with_model():
     table = generated_tables(User)[0]
     conn = sqlite3.connect(":memory:")
@@ -163,6 +224,25 @@ def test_db_push_sync_indexes_aligns_with_model():
     }
 
 
+def test_db_push_reads_existing_indexes_once(monkeypatch):
+    tables = generated_tables(User, Membership)
+    conn = sqlite3.connect(":memory:")
+    push_sqlite(conn, tables)
+
+    def fail_per_table(*_: object) -> set[str]:
+        raise AssertionError("indexes should come from the prefetched snapshot")
+
+    monkeypatch.setattr(SQLITE_PUSHER, "fetch_existing_indexes", fail_per_table)
+    conn.execute('DROP INDEX "idx_User_name"')
+    db_push(tables, conn, provider="sqlite", sync_indexes=True)
+
+    index_names = {
+        name
+        for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='User'")
+    }
+    assert "idx_User_name" in index_names
+
+
 def test_db_push_without_sync_indexes_leaves_extra_indexes():
     table = generated_tables(User)[0]
     conn = sqlite3.connect(":memory:")
@@ -67,3 +67,19 @@ def test_type_hint_renderer_accepts_type_hint() -> None:
     assert renderer.render(TypeHint(Annotated[list[str], "metadata"])) == (
         "Annotated[list[str], 'metadata']"
     )
+
+
+def test_type_hint_renderer_handles_nested_generics() -> None:
+    renderer = TypeHintRenderer({})
+
+    assert renderer.render(TypeHint(dict[str, list[tuple[int, ...]]])) == (
+        "dict[str, list[tuple[int, ...]]]"
+    )
+    assert renderer.render(TypeHint(tuple[int, str | None, frozenset[bytes]])) == (
+        "tuple[int, str | None, frozenset[bytes]]"
+    )
+
+    deep: object = int
+    for _ in range(2000):
+        deep = list[deep]  # type: ignore[valid-type]
+    assert renderer.render(TypeHint(deep)) == "list[" * 2000 + "int" + "]" * 2000